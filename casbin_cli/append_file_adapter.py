@@ -0,0 +1,155 @@
+import os
+from casbin.persist.adapters import FileAdapter
+
+def load_policy_lines(lines, model):
+    """Add every rule in lines to the model like casbin's load_policy_line, sharing repeated tokens.
+
+    Large policies repeat the same subjects, objects and actions on every line; each of them becomes
+    one string object. A dict local to the load does this rather than sys.intern, whose table would
+    keep an entry for every unique token. Rules stay lists because casbin compares rules as lists.
+    """
+    tokens_seen = {}
+    share = tokens_seen.setdefault
+    parse = AppendFileAdapter._parse_line
+    sections = model.model
+    for line in lines:
+        tokens = parse(line)
+        if tokens is None:
+            continue
+        assertion = sections.get(tokens[0][:1], {}).get(tokens[0])
+        if assertion is not None:
+            assertion.policy.append([share(token, token) for token in tokens[1:]])
+
+class AppendFileAdapter(FileAdapter):
+    def __init__(self, file_path):
+        """File adapter that appends added rules and streams the file once to remove or update rules.
+
+        writes counts the changes persisted this way, so callers can tell whether save_policy() is still needed.
+        """
+        super().__init__(file_path)
+        self.writes = 0
+
+    def load_policy(self, model):
+        """Load the policy file, repeated tokens sharing one string object"""
+        if not os.path.isfile(self._file_path):
+            raise RuntimeError("invalid file path, file path cannot be empty")
+        with open(self._file_path, encoding='utf-8') as f:
+            load_policy_lines(f, model)
+
+    def add_policy(self, sec, ptype, rule):
+        """Append one rule to the end of the policy file"""
+        return self.add_policies(sec, ptype, [rule])
+
+    def add_policies(self, sec, ptype, rules):
+        """Append rules to the end of the policy file"""
+        lines = [AppendFileAdapter._format_line(ptype, rule) for rule in rules]
+        with open(self._file_path, 'ab+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+        self.writes += 1
+        return True
+
+    def remove_policy(self, sec, ptype, rule):
+        """Drop the first line holding the rule"""
+        return self.remove_policies(sec, ptype, [rule])
+
+    def remove_policies(self, sec, ptype, rules):
+        """Drop the first line holding each of the rules"""
+        pending = [[ptype] + list(rule) for rule in rules]
+
+        def keep(tokens):
+            if tokens in pending:
+                pending.remove(tokens)
+                return False
+            return True
+
+        self._rewrite(lambda tokens, line: line if keep(tokens) else None)
+        return True
+
+    def remove_filtered_policy(self, sec, ptype, field_index, *field_values):
+        """Drop every line of ptype matching the field filter"""
+        def matches(tokens):
+            rule = tokens[1:]
+            return tokens[0] == ptype and all(
+                value == "" or (field_index + i < len(rule) and rule[field_index + i] == value)
+                for i, value in enumerate(field_values)
+            )
+
+        self._rewrite(lambda tokens, line: None if matches(tokens) else line)
+        return True
+
+    def update_policy(self, sec, ptype, old_rule, new_rule):
+        """Replace the line holding old_rule"""
+        return self.update_policies(sec, ptype, [old_rule], [new_rule])
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        """Replace the lines holding old_rules with new_rules"""
+        pending = [([ptype] + list(old), AppendFileAdapter._format_line(ptype, new))
+                   for old, new in zip(old_rules, new_rules)]
+
+        def replace(tokens, line):
+            for i, (old_tokens, new_line) in enumerate(pending):
+                if tokens == old_tokens:
+                    del pending[i]
+                    return new_line + '\n'
+            return line
+
+        self._rewrite(replace)
+        return True
+
+    def _rewrite(self, transform):
+        """Stream the policy file through transform(tokens, line) -> line or None"""
+        import tempfile
+        directory = os.path.dirname(os.path.abspath(self._file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with open(self._file_path, 'r', encoding='utf-8', newline='') as source, \
+                    os.fdopen(fd, 'w', encoding='utf-8', newline='') as target:
+                for line in source:
+                    tokens = AppendFileAdapter._parse_line(line)
+                    if tokens is not None:
+                        if not line.endswith('\n'):
+                            line += '\n'
+                        line = transform(tokens, line)
+                    if line is not None:
+                        target.write(line)
+            os.chmod(temp_path, os.stat(self._file_path).st_mode & 0o7777)
+            os.replace(temp_path, self._file_path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.writes += 1
+
+    @staticmethod
+    def _format_line(ptype, rule):
+        return ptype + ", " + ", ".join(rule)
+
+    @staticmethod
+    def _parse_line(line):
+        """Split a policy line the way casbin's load_policy_line does, None for blanks and comments"""
+        line = line.strip()
+        if line == "" or line[:1] == "#":
+            return None
+        # Commas only nest inside brackets and parentheses; most lines have none
+        if '[' not in line and '(' not in line and ']' not in line and ')' not in line:
+            return [token.strip() for token in line.split(',')]
+
+        depth = 0
+        tokens = [""]
+        for c in line:
+            if c in "[(":
+                depth += 1
+            elif c in "])":
+                depth -= 1
+            elif c == "," and depth == 0:
+                tokens.append("")
+                continue
+            tokens[-1] += c
+        return [token.strip() for token in tokens]
@@ -0,0 +1,241 @@
+import gc
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import casbin
+from casbin.persist.adapters import FileAdapter
+from .enforcer_factory import EnforcerFactory
+from .response import ResponseBody
+from .serializer import Serializer
+
+# Same shape as examples/rbac_model.conf
+RBAC_MODEL = """[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[role_definition]
+g = _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub) && r.obj == p.obj && r.act == p.act"""
+
+def percentiles(samples):
+    """p50/p95/p99 and mean of samples in seconds, reported in milliseconds"""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "mean": None}
+    ordered = sorted(samples)
+
+    def rank(p):
+        index = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered))) - 1))
+        return round(ordered[index] * 1000, 4)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 4)
+    }
+
+class Benchmark:
+    def __init__(self, users=1000, roles=100, objects=100, depth=3, requests=10000, cold_starts=5, seed=0,
+                 memory=False):
+        """Synthetic RBAC workload: users assigned to a role hierarchy granting access to objects.
+
+        memory adds a comparison of the memory held after loading with casbin's file adapter and with
+        the CLI's, which traces every allocation and is slow on large policies.
+        """
+        if min(users, roles, objects, depth) < 1 or requests < 0 or cold_starts < 0:
+            raise ValueError("users, roles, objects and depth must be at least 1, requests and cold starts not negative")
+        self.users = users
+        self.roles = roles
+        self.objects = objects
+        self.depth = depth
+        self.requests = requests
+        self.cold_starts = cold_starts
+        self.seed = seed
+        self.memory = memory
+
+    def generate_policy(self):
+        """Policy lines for the workload, roles at each level inherit from a role one level up"""
+        lines = []
+        for k in range(self.objects):
+            lines.append(f"p, role{k % self.roles}, obj{k}, read")
+            lines.append(f"p, role{(k + 1) % self.roles}, obj{k}, write")
+
+        # Spread the roles over depth levels; every role below the top level gets a parent
+        per_level = max(1, -(-self.roles // self.depth))
+        for i in range(per_level, self.roles):
+            parent = (i // per_level - 1) * per_level + i % per_level
+            lines.append(f"g, role{i}, role{parent}")
+
+        for u in range(self.users):
+            lines.append(f"g, user{u}, role{self.roles - 1 - u % self.roles}")
+        return lines
+
+    def generate_requests(self):
+        """Random (sub, obj, act) requests, reproducible through the seed"""
+        rng = random.Random(self.seed)
+        return [
+            [f"user{rng.randrange(self.users)}", f"obj{rng.randrange(self.objects)}", rng.choice(["read", "write"])]
+            for _ in range(self.requests)
+        ]
+
+    def run(self):
+        """Measure cold start, model/policy load and enforce latency, returning a JSON-ready report"""
+        workdir = tempfile.mkdtemp(prefix='casbin-bench-')
+        model_path = os.path.join(workdir, 'model.conf')
+        policy_path = os.path.join(workdir, 'policy.csv')
+        policy_lines = self.generate_policy()
+        with open(model_path, 'w') as f:
+            f.write(RBAC_MODEL)
+        with open(policy_path, 'w') as f:
+            f.write("\n".join(policy_lines) + "\n")
+
+        try:
+            requests = self.generate_requests()
+
+            start = time.perf_counter()
+            casbin.Model().load_model_from_text(RBAC_MODEL)
+            model_load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            enforcer = EnforcerFactory.create_enforcer(model_path, policy_path)
+            total_load = time.perf_counter() - start
+
+            latencies = []
+            allowed = 0
+            start = time.perf_counter()
+            for request in requests:
+                request_start = time.perf_counter()
+                allowed += enforcer.enforce(*request)
+                latencies.append(time.perf_counter() - request_start)
+            enforce_total = time.perf_counter() - start
+
+            serialize = self._serialize(enforcer)
+            del enforcer
+            memory = Benchmark._memory(model_path, policy_path) if self.memory else None
+
+            cold_starts = [self._cold_start(model_path, policy_path, requests[0] if requests else ["user0", "obj0", "read"])
+                           for _ in range(self.cold_starts)]
+        finally:
+            for path in (model_path, policy_path):
+                os.unlink(path)
+            os.rmdir(workdir)
+
+        return {
+            "config": {
+                "users": self.users,
+                "roles": self.roles,
+                "objects": self.objects,
+                "depth": self.depth,
+                "requests": self.requests,
+                "coldStarts": self.cold_starts,
+                "seed": self.seed
+            },
+            "policy": {
+                "rules": sum(1 for line in policy_lines if line.startswith("p,")),
+                "groupingRules": sum(1 for line in policy_lines if line.startswith("g,"))
+            },
+            "coldStartMs": percentiles(cold_starts),
+            "loadMs": {
+                "model": round(model_load * 1000, 4),
+                "policy": round(max(0.0, total_load - model_load) * 1000, 4),
+                "total": round(total_load * 1000, 4)
+            },
+            "enforce": {
+                "requests": len(requests),
+                "allowed": allowed,
+                "throughputPerSec": round(len(requests) / enforce_total, 2) if enforce_total > 0 else None,
+                "latencyMs": percentiles(latencies)
+            },
+            "serializeMs": serialize,
+            "memory": memory
+        }
+
+    def _serialize(self, enforcer, repeat=5):
+        """Best-of-repeat time to encode large list responses with every installed JSON backend"""
+        # The user with the deepest role chain has the most implicit permissions
+        user = f"user{self.users - 1 - (self.users - 1) % self.roles}"
+        payloads = {
+            "getPolicy": enforcer.get_policy(),
+            "getImplicitPermissionsForUser": enforcer.get_implicit_permissions_for_user(user)
+        }
+
+        report = {}
+        for command, rows in payloads.items():
+            body = ResponseBody(explain=rows).to_dict()
+            report[command] = {"rows": len(rows)}
+            for name in Serializer.available():
+                serializer = Serializer(name)
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    serializer.dumps_bytes(body)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                report[command][name] = round(best * 1000, 4)
+        return report
+
+    @staticmethod
+    def _memory(model_path, policy_path):
+        """MiB held by an enforcer loaded with casbin's FileAdapter and with the CLI, total and policy rules alone"""
+        loaders = {
+            "casbin": lambda: casbin.Enforcer(model_path, FileAdapter(policy_path)),
+            "cli": lambda: EnforcerFactory.create_enforcer(model_path, policy_path),
+        }
+        report = {}
+        for name, load in loaders.items():
+            gc.collect()
+            tracemalloc.start()
+            try:
+                enforcer = load()
+                gc.collect()
+                traced, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            report[name] = {
+                "tracedMiB": round(traced / 1024.0 / 1024.0, 3),
+                "peakMiB": round(peak / 1024.0 / 1024.0, 3),
+                "policyMiB": round(Benchmark._policy_bytes(enforcer) / 1024.0 / 1024.0, 3)
+            }
+            del enforcer
+
+        casbin_traced = report["casbin"]["tracedMiB"]
+        report["savedPercent"] = round(100 * (1 - report["cli"]["tracedMiB"] / casbin_traced), 2) if casbin_traced else None
+        return report
+
+    @staticmethod
+    def _policy_bytes(enforcer):
+        """Size of the rule lists and their strings, each string object counted once"""
+        seen = set()
+        total = 0
+        for sec in ('p', 'g'):
+            for assertion in enforcer.get_model().model.get(sec, {}).values():
+                for rule in assertion.policy:
+                    total += sys.getsizeof(rule)
+                    for token in rule:
+                        if id(token) not in seen:
+                            seen.add(id(token))
+                            total += sys.getsizeof(token)
+        return total
+
+    @staticmethod
+    def _cold_start(model_path, policy_path, request):
+        """Wall time of one complete CLI process answering a single enforce"""
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = package_root + os.pathsep + env.get('PYTHONPATH', '')
+        command = [sys.executable, '-m', 'casbin_cli.client', 'enforce', '-m', model_path, '-p', policy_path] + request
+
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        return time.perf_counter() - start
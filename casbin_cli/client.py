@@ -1,10 +1,12 @@
-import argparse    
+import json
+import os
 import sys    
-import json    
-from casbin_cli.command_executor import CommandExecutor      
-from casbin_cli.enforcer_factory import EnforcerFactory      
-from casbin_cli.utils import process_line_breaks   
+import time
+from casbin_cli.utils import process_line_breaks, timed_import, format_startup_report, is_compiled_policy, Timings
 from casbin_cli.__version__ import __version__  
+
+# Reference point for --startup-report
+_START_TIME = time.perf_counter()
     
 class Client:    
     @staticmethod    
@@ -12,7 +14,59 @@ class Client:
         """The main entry function processes command-line parameters and performs corresponding operations"""    
         if args is None:    
             args = sys.argv[1:]    
-            
+
+        startup_report, args = Client._pop_flag(args, '--startup-report')
+        timings, args = Client._pop_flag(args, '--timings')
+        profile_memory, args = Client._pop_flag(args, '--profile-memory')
+        try:
+            profile_path, args = Client._pop_option(args, '--profile')
+        except ValueError as e:
+            Client._fail(e)
+
+        try:
+            if profile_path is not None:
+                Profiler = timed_import('casbin_cli.profiler').Profiler
+                profiler = Profiler(profile_path, memory=profile_memory)
+                try:
+                    return profiler.run(Client._run, args, Timings() if timings else None)
+                finally:
+                    print(f"Profile written to {profiler.path} and {profiler.summary_path}", file=sys.stderr)
+            return Client._run(args, Timings() if timings else None)
+        finally:
+            if startup_report:
+                print(format_startup_report(_START_TIME), file=sys.stderr)
+
+    @staticmethod
+    def _pop_flag(args, flag):
+        """Remove a global flag from anywhere in args, returns (present, remaining args)"""
+        if flag not in args:
+            return False, args
+        return True, [arg for arg in args if arg != flag]
+
+    @staticmethod
+    def _pop_option(args, option):
+        """Remove a global option and its value from args, returns (value or None, remaining args)"""
+        remaining = []
+        value = None
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg == option:
+                if i + 1 >= len(args):
+                    raise ValueError(f"{option} requires a value")
+                value = args[i + 1]
+                i += 2
+                continue
+            if arg is not None and arg.startswith(option + '='):
+                value = arg[len(option) + 1:]
+            else:
+                remaining.append(arg)
+            i += 1
+        return value, remaining
+
+    @staticmethod
+    def _run(args, timings=None):
+        """Dispatch a command, importing only the subsystems it needs"""
         try:    
             if not args:    
                 Client._print_usage_and_exit()    
@@ -35,48 +89,105 @@ class Client:
                 shell_type = args[1]  
                 Client._generate_completion(shell_type)  
                 return ""  
+            elif command_name == 'bench':
+                result = Client._bench(args[1:])
+                print(result)
+                return result
                 
-            # Handle line breaks  
-            processed_args = [args[0]]    
-            for i in range(1, len(args)):    
-                processed_args.append(process_line_breaks(args[i]) if args[i] else None)    
-                
-            # Parse command-line parameters    
-            parsed_args = Client._parse_args(processed_args[1:])    
+            # Phases are always measured but only reported with --timings
+            recorder = timings or Timings()
+
+            with recorder.measure('parse'):
+                # Handle line breaks  
+                processed_args = [args[0]]    
+                for i in range(1, len(args)):    
+                    processed_args.append(process_line_breaks(args[i]) if args[i] else None)    
+
+                # Parse command-line parameters    
+                parsed_args = Client._parse_args(processed_args[1:])    
                 
             # enforcer    
-            enforcer = EnforcerFactory.create_enforcer(    
-                parsed_args.model,     
-                parsed_args.policy    
-            )    
+            with recorder.measure('load'):
+                EnforcerFactory = timed_import('casbin_cli.enforcer_factory').EnforcerFactory
+                enforcer = EnforcerFactory.create_enforcer(    
+                    parsed_args.model,     
+                    parsed_args.policy,
+                    cache_dir=parsed_args.cache_dir,
+                    cache_size=parsed_args.cache_size,
+                    index=parsed_args.index
+                )    
                 
             # Add custom functions (if any)    
             if parsed_args.add_function:    
                 # Here, the functionality of custom functions can be extended    
                 pass    
                 
+            # Long-running server mode keeps the enforcer warm
+            if command_name == 'serve':
+                Client._serve(Client._create_session(enforcer, parsed_args, timings), parsed_args.args)
+                return ""
+
+            # HTTP mode exposes every command as a POST endpoint
+            if command_name == 'http':
+                Client._serve_http(Client._create_session(enforcer, parsed_args, timings), parsed_args.args)
+                return ""
+
+            # Streaming mode answers one request per stdin line
+            if command_name == 'stream':
+                Client._create_session(enforcer, parsed_args, timings).run_stream(sys.stdin, sys.stdout)
+                return ""
+
+            # Script mode applies many requests and saves the policy once
+            if command_name == 'script':
+                result = Client._run_script(Client._create_session(enforcer, parsed_args), parsed_args.args)
+                print(result)
+                return result
+
+            # Requests read from a file are enforced chunk by chunk and written out as they are decided
+            if parsed_args.requests is not None:
+                Client._batch_enforce_file(enforcer, command_name, parsed_args, timings)
+                return ""
+
             # executive command    
-            executor = CommandExecutor(enforcer, command_name, parsed_args.args)    
-            result = executor.execute()    
-                
-            print(result)    
-            return result  
+            CommandExecutor = timed_import('casbin_cli.command_executor').CommandExecutor
+            executor = CommandExecutor(enforcer, command_name, parsed_args.args, workers=parsed_args.workers,
+                                       timings=timings, limit=parsed_args.limit, offset=parsed_args.offset)    
+
+            # NDJSON output writes list results row by row instead of building one JSON document
+            if parsed_args.ndjson:
+                executor.execute_ndjson(sys.stdout)
+                if timings is not None:
+                    print(json.dumps({"timing": timings.to_dict()}), file=sys.stderr)
+                return ""
+
+            # Encoded bytes go straight to the binary stdout buffer
+            result = executor.execute_bytes()
+            Serializer = timed_import('casbin_cli.serializer').Serializer
+            Serializer.line_writer(sys.stdout)(result)
+            sys.stdout.flush()
+            return result.decode('utf-8')
             
         except Exception as e:     
-            if hasattr(e, '__cause__') and e.__cause__:    
-                error_msg = f"{str(e)}: {str(e.__cause__)}"    
-            else:    
-                error_msg = str(e) if str(e) else f"{type(e).__name__}: {repr(e)}"    
-          
-            if hasattr(sys, '_called_from_test') or 'pytest' in sys.modules:    
-                raise type(e)(error_msg) from e    
-            else:    
-                print(error_msg)    
-                sys.exit(1)  
+            Client._fail(e)
+
+    @staticmethod
+    def _fail(e):
+        """Report an error as one line and exit with status 1; under pytest the error is raised instead"""
+        if hasattr(e, '__cause__') and e.__cause__:    
+            error_msg = f"{str(e)}: {str(e.__cause__)}"    
+        else:    
+            error_msg = str(e) if str(e) else f"{type(e).__name__}: {repr(e)}"    
+      
+        if hasattr(sys, '_called_from_test') or 'pytest' in sys.modules:    
+            raise type(e)(error_msg) from e    
+        else:    
+            print(error_msg)    
+            sys.exit(1)  
         
     @staticmethod    
     def _parse_args(args):    
         """Parse command-line parameters"""    
+        import argparse
         parser = argparse.ArgumentParser(add_help=False)    
             
         parser.add_argument('-AF', '--add-function',     
@@ -90,6 +201,58 @@ class Client:
         parser.add_argument('-p', '--policy',     
                           help='The path of the policy file or policy text',     
                           required=True)    
+
+        parser.add_argument('--cache-dir',
+                          help='Directory for snapshots of the loaded model and policy',
+                          required=False)
+
+        parser.add_argument('--limit', type=int,
+                          help='Return at most this many rows of a list result',
+                          required=False)
+
+        parser.add_argument('--offset', type=int, default=0,
+                          help='Skip this many rows of a list result',
+                          required=False)
+
+        parser.add_argument('--ndjson', action='store_true',
+                          help='Write list results as one JSON row per line',
+                          required=False)
+
+        parser.add_argument('--role-index', action='store_true',
+                          help='Keep the transitive role closure materialized for implicit role queries',
+                          required=False)
+
+        parser.add_argument('--index', action='store_true',
+                          help='Evaluate the matcher only on the policy rules a hash index finds for the request',
+                          required=False)
+
+        parser.add_argument('--watch', action='store_true',
+                          help='Apply edits of the policy file to the running enforcer',
+                          required=False)
+
+        parser.add_argument('--watch-interval', type=float,
+                          help='Seconds between checks of the watched policy file',
+                          required=False)
+
+        parser.add_argument('--workers', type=int, default=1,
+                          help='Number of worker processes for batchEnforce',
+                          required=False)
+
+        parser.add_argument('--requests',
+                          help='CSV or NDJSON file of requests for batchEnforce',
+                          required=False)
+
+        parser.add_argument('--decision-cache', type=int,
+                          help='serve/stream: Cache up to this many enforce decisions',
+                          required=False)
+
+        parser.add_argument('--decision-cache-ttl', type=float,
+                          help='serve/stream: Seconds a cached decision stays valid',
+                          required=False)
+
+        parser.add_argument('--cache-size', type=int,
+                          help='Maximum number of snapshots kept in the cache directory',
+                          required=False)
             
         # Parse the known parameters and use the remaining ones as command parameters    
         known_args, remaining_args = parser.parse_known_args(args)    
@@ -97,12 +260,146 @@ class Client:
             
         return known_args    
         
+    @staticmethod
+    def _create_session(enforcer, parsed_args, timings=None):
+        """Build the session shared by the long-running modes"""
+        Session = timed_import('casbin_cli.session').Session
+        decision_cache = None
+        if parsed_args.decision_cache is not None:
+            DecisionCache = timed_import('casbin_cli.decision_cache').DecisionCache
+            decision_cache = DecisionCache(parsed_args.decision_cache, parsed_args.decision_cache_ttl)
+        session = Session(enforcer, decision_cache=decision_cache, timings=timings is not None,
+                          role_index=parsed_args.role_index)
+        if parsed_args.watch:
+            if not os.path.isfile(parsed_args.policy or ''):
+                raise ValueError("--watch requires a policy file")
+            if is_compiled_policy(parsed_args.policy):
+                raise ValueError("--watch requires a CSV policy file, not a compiled one")
+            policy_watcher = timed_import('casbin_cli.policy_watcher')
+            policy_watcher.PolicyWatcher(session, parsed_args.policy,
+                                         parsed_args.watch_interval or policy_watcher.DEFAULT_WATCH_INTERVAL).start()
+        return session
+
+    @staticmethod
+    def _batch_enforce_file(enforcer, command_name, parsed_args, timings=None):
+        """Stream the decisions for the requests in the --requests file to stdout"""
+        if command_name != 'batchEnforce':
+            raise ValueError("--requests is only supported by batchEnforce")
+        if parsed_args.args:
+            raise ValueError("batchEnforce takes requests either as arguments or from --requests, not both")
+
+        request_file = timed_import('casbin_cli.request_file')
+        recorder = timings or Timings()
+        try:
+            with recorder.measure('execute'):
+                request_file.batch_enforce_file(enforcer, parsed_args.requests, sys.stdout,
+                                                workers=parsed_args.workers, ndjson=parsed_args.ndjson)
+        except request_file.InterruptedOutput as e:
+            # Decisions are already on stdout, keep the error apart from them
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        if timings is not None:
+            print(json.dumps({"timing": timings.to_dict()}), file=sys.stderr)
+
+    @staticmethod
+    def _run_script(session, args):
+        """Run the requests in the given file, or stdin when no file or '-' is given"""
+        if len(args) > 1:
+            raise ValueError("script accepts at most one request file")
+        if not args or args[0] == '-':
+            return session.run_script(sys.stdin)
+        with open(args[0], encoding='utf-8') as f:
+            return session.run_script(f)
+
+    @staticmethod
+    def _bench(args):
+        """Run the synthetic RBAC benchmark and return its JSON report"""
+        import argparse
+        import json
+        parser = argparse.ArgumentParser(prog='casbin bench', add_help=False)
+        parser.add_argument('--users', type=int, default=1000, help='Number of users')
+        parser.add_argument('--roles', type=int, default=100, help='Number of roles')
+        parser.add_argument('--objects', type=int, default=100, help='Number of objects')
+        parser.add_argument('--depth', type=int, default=3, help='Depth of the role hierarchy')
+        parser.add_argument('--requests', type=int, default=10000, help='Number of enforce requests to time')
+        parser.add_argument('--cold-starts', type=int, default=5, help='Number of CLI processes to time')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the generated requests')
+        parser.add_argument('--memory', action='store_true',
+                            help="Compare the memory held after loading with casbin's file adapter and the CLI's")
+        bench_args = parser.parse_args(args)
+
+        Benchmark = timed_import('casbin_cli.bench').Benchmark
+        report = Benchmark(users=bench_args.users, roles=bench_args.roles, objects=bench_args.objects,
+                           depth=bench_args.depth, requests=bench_args.requests,
+                           cold_starts=bench_args.cold_starts, seed=bench_args.seed,
+                           memory=bench_args.memory).run()
+        return json.dumps(report, indent=2)
+
+    @staticmethod
+    def _serve(session, args):
+        """Answer newline-delimited JSON requests over a Unix socket or TCP"""
+        import argparse
+        import signal
+        CommandServer = timed_import('casbin_cli.server').CommandServer
+
+        parser = argparse.ArgumentParser(prog='casbin serve', add_help=False)
+        parser.add_argument('--socket', help='The Unix domain socket path to listen on')
+        parser.add_argument('--host', default='127.0.0.1', help='The TCP host to bind')
+        parser.add_argument('--port', type=int, help='The TCP port to listen on')
+        serve_args = parser.parse_args(args)
+
+        server = CommandServer(session, socket_path=serve_args.socket,
+                               host=serve_args.host, port=serve_args.port)
+        # Exit cleanly on SIGTERM so the socket file is removed
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Serving on {server.address}", file=sys.stderr)
+        server.serve_forever()
+
+    @staticmethod
+    def _serve_http(session, args):
+        """Answer POST /<command> requests over HTTP"""
+        import argparse
+        import signal
+        HttpCommandServer = timed_import('casbin_cli.http_server').HttpCommandServer
+
+        parser = argparse.ArgumentParser(prog='casbin http', add_help=False)
+        parser.add_argument('--host', default='127.0.0.1', help='The host to bind')
+        parser.add_argument('--port', type=int, default=8080, help='The port to listen on')
+        parser.add_argument('--allow-origin', help='Allow browser requests from this origin (CORS)')
+        parser.add_argument('--pool-size', type=int, help='Enforcers kept for requests carrying their own model')
+        parser.add_argument('--pool-max-rules', type=int, help='Policy rules kept across pooled enforcers')
+        http_args = parser.parse_args(args)
+
+        enforcer_pool = timed_import('casbin_cli.enforcer_pool')
+        pool = enforcer_pool.EnforcerPool(http_args.pool_size or enforcer_pool.DEFAULT_POOL_SIZE, http_args.pool_max_rules)
+        server = HttpCommandServer(session, host=http_args.host, port=http_args.port,
+                                   allow_origin=http_args.allow_origin, pool=pool)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Serving HTTP on {server.address}", file=sys.stderr)
+        server.serve_forever()
+
     @staticmethod    
     def _print_usage_and_exit():    
         """Print the instructions for use and exit"""    
         print("Error: Command not recognized")    
         sys.exit(1)    
         
+    # Commands handled by the client itself rather than dispatched to the enforcer
+    _MODES = [
+        ('serve', "Keep the enforcer loaded and answer JSON requests over a socket"),
+        ('http', "Keep the enforcer loaded and answer POST /<command> requests over HTTP"),
+        ('stream', "Keep the enforcer loaded and answer JSON requests read from stdin"),
+        ('script', "Apply the JSON requests in a file (or stdin) in memory and save the policy once"),
+        ('bench', "Measure cold start, load time and enforce latency on a generated RBAC policy"),
+        ('completion', "Generate shell completion scripts (bash|zsh|fish)"),
+    ]
+
+    @staticmethod
+    def _completion_commands():
+        """Every command name, as offered by the shell completions"""
+        COMMANDS = timed_import('casbin_cli.commands').COMMANDS
+        return list(COMMANDS) + [name for name, _ in Client._MODES]
+
     @staticmethod    
     def _print_help():    
         """Print help information"""   
@@ -113,16 +410,37 @@ Usage: casbin [Method] [options] [args]
     It provides support for enforcing authorization based on various access control models.    
     
     Method:    
-      enforce       Test if a 'subject' can access an 'object' with a given 'action' based on the policy    
-      enforceEx     Check permissions and get which policy it matches    
-      addPolicy     Add a policy rule to the policy file    
-      removePolicy  Remove a policy rule from the policy file    
-      completion    Generate shell completion scripts (bash|zsh|fish)  
+{methods}
     
     Options:    
       -m, --model <model>          The path of the model file or model text    
       -p, --policy <policy>        The path of the policy file or policy text    
       -AF, --add-function <func>   Add custom function    
+      --cache-dir <dir>            Reuse snapshots of the parsed model and policy stored in <dir>
+      --cache-size <n>             Maximum number of snapshots kept in the cache directory (default 32)
+      --limit <n> --offset <n>     Return one page of a list result such as getPolicy
+      --ndjson                     Stream list results as one JSON row per line
+      --workers <n>                batchEnforce: Shard the requests across <n> worker processes
+      --requests <file>            batchEnforce: Read the requests from a CSV or NDJSON file in chunks and write
+                                   the decisions as they are made
+      --decision-cache <n>         serve/stream/http: Cache up to <n> enforce decisions, flushed on any policy change
+      --decision-cache-ttl <sec>   serve/stream/http: Expire cached decisions after <sec> seconds
+      --role-index                 serve/stream/script/http: Answer implicit role and permission queries from a
+                                   materialized role closure kept up to date on every change
+      --index                      Index the policy on the columns the matcher compares with ==, so enforce only
+                                   evaluates the rules that can match
+      --watch                      serve/stream/http: Apply only the added and removed rules when the policy file
+                                   changes on disk
+      --watch-interval <sec>       With --watch, seconds between checks of the file's modification time (default 1)
+      --timings                    Add a "timing" object with the duration of each phase in milliseconds
+      --profile <path>             Write a cProfile dump to <path> and a top-20 summary to <path>.txt
+      --profile-memory             With --profile, also record peak memory with tracemalloc
+      --startup-report             Print how long startup and each lazily imported subsystem took to stderr
+      --socket <path>              serve: The Unix domain socket to listen on
+      --host <host> --port <port>  serve/http: The TCP address to listen on (default host 127.0.0.1, http port 8080)
+      --allow-origin <origin>      http: Allow browser requests from <origin>
+      --pool-size <n>              http: Enforcers kept for requests that send their own model and policy (default 32)
+      --pool-max-rules <n>         http: Policy rules kept across those pooled enforcers
     
     args:    
       Parameters required for the method    
@@ -130,9 +448,19 @@ Usage: casbin [Method] [options] [args]
     Examples:    
       casbin enforce -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv" "alice" "data1" "read"    
       casbin addPolicy -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv" "alice" "data2" "write"  
+      casbin serve -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv" --socket /tmp/casbin.sock
+      casbin http -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv" --port 8080
+      echo '{"cmd":"enforce","args":["alice","data1","read"]}' | casbin stream -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv"
+      casbin script -m "examples/rbac_model.conf" -p "examples/rbac_policy.csv" migration.ndjson
+      casbin bench --users 10000 --roles 500 --objects 1000 --depth 4 > report.json
+      casbin bench --users 1000000 --requests 0 --cold-starts 0 --memory
       casbin completion bash > casbin_completions.bash  
 """    
-        print(help_text)  
+        COMMANDS = timed_import('casbin_cli.commands').COMMANDS
+        width = max(len(name) for name in list(COMMANDS) + [name for name, _ in Client._MODES]) + 2
+        methods = [f"      {name.ljust(width)}{command.summary}" for name, command in COMMANDS.items()]
+        methods += [f"      {name.ljust(width)}{summary}" for name, summary in Client._MODES]
+        print(help_text.replace("{methods}", "\n".join(methods)))  
   
     @staticmethod  
     def _generate_completion(shell_type):  
@@ -151,8 +479,7 @@ Usage: casbin [Method] [options] [args]
     def _generate_bash_completion():  
         """Generate bash completion script"""  
         # Get all available commands  
-        commands = ['enforce', 'enforceEx', 'addPolicy', 'removePolicy', 'completion', 'batchEnforce',   
-                   'getAllSubjects', 'getAllObjects', 'getAllActions', 'getAllRoles']  
+        commands = Client._completion_commands()
           
         bash_script = f'''#!/bin/bash  
 _casbin_completions()  
@@ -190,8 +517,7 @@ complete -F _casbin_completions casbin-python-cli
     @staticmethod  
     def _generate_zsh_completion():  
         """Generate zsh completion script"""  
-        commands = ['enforce', 'enforceEx', 'addPolicy', 'removePolicy', 'completion', 'batchEnforce',  
-                   'getAllSubjects', 'getAllObjects', 'getAllActions', 'getAllRoles']  
+        commands = Client._completion_commands()
           
         zsh_script = f'''#compdef casbin-python-cli  
   
@@ -208,7 +534,7 @@ _casbin_python_cli() {{
                 completion)  
                     _arguments '1:shell:(bash zsh fish)'  
                     ;;  
-                enforce|enforceEx|addPolicy|removePolicy|batchEnforce)  
+                {'|'.join(name for name in commands if name not in ('bench', 'completion'))})  
                     _arguments \\  
                         '-m[model file]:file:_files' \\  
                         '--model[model file]:file:_files' \\  
@@ -227,8 +553,7 @@ _casbin_python_cli "$@"
     @staticmethod  
     def _generate_fish_completion():  
         """Generate fish completion script"""  
-        commands = ['enforce', 'enforceEx', 'addPolicy', 'removePolicy', 'completion', 'batchEnforce',  
-                   'getAllSubjects', 'getAllObjects', 'getAllActions', 'getAllRoles']  
+        commands = Client._completion_commands()
           
         fish_script = f'''# Fish completion for casbin-python-cli  
   
@@ -1,96 +1,95 @@
-import json  
-import inspect  
+from functools import partial
 from typing import Any, List  
+from .commands import get_command
 from .response import ResponseBody  
+from .serializer import Serializer, get_serializer
+from .utils import Timings, timed_import
   
 class CommandExecutor:  
-    def __init__(self, enforcer, command_name, args):  
-        """Initialize the command executor"""  
+    # Commands casbin has no method for, implemented by the CLI on top of the enforcer: (module, function),
+    # imported only when the command runs
+    CLI_METHODS = {
+        'getImplicitUsersForRole': ('casbin_cli.role_index', 'RoleClosureIndex.walk_users'),
+        'diffPolicy': ('casbin_cli.policy_diff', 'diff_policy'),
+        'applyPolicy': ('casbin_cli.policy_diff', 'apply_policy'),
+        'importPolicies': ('casbin_cli.policy_import', 'import_policies'),
+        'compile': ('casbin_cli.compiled_policy', 'compile_policy'),
+    }
+
+    def __init__(self, enforcer, command_name, args, workers=1, decision_cache=None, save_policy=True, timings=None,
+                 limit=None, offset=0, role_index=None):  
+        """Initialize the command executor, batchEnforce uses a process pool when workers > 1.
+
+        With save_policy=False modifications stay in memory until the caller saves the policy.
+        When timings is given, the phase durations are added to the JSON output.
+        limit and offset select a page of list results such as getPolicy.
+        A RoleClosureIndex answers the implicit role queries and is kept in sync with policy changes.
+        """  
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("limit and offset must not be negative")
         self.enforcer = enforcer  
         self.command_name = command_name  
         self.args = args  
+        self.workers = workers
+        self.decision_cache = decision_cache
+        self.save_policy = save_policy
+        self.timings = timings
+        self.limit = limit
+        self.offset = offset
+        self.role_index = role_index
   
     def execute(self):  
         """Execute the command and return the result in JSON format"""  
+        return self.execute_bytes().decode('utf-8')
+
+    def execute_bytes(self):
+        """Execute the command and return the UTF-8 encoded JSON result"""
+        response = self.execute_response()
+        serializer = get_serializer(CommandExecutor._rows(response))
+        if self.timings is None:
+            return serializer.dumps_bytes(response.to_dict())
+
+        with self.timings.measure('serialize'):
+            result = serializer.dumps_bytes(response.to_dict())
+        # The timing object is appended after encoding so that it covers the encoding itself
+        return result[:-1] + b',"timing":' + serializer.dumps_bytes(self.timings.to_dict()) + b'}'
+
+    def execute_ndjson(self, output_stream):
+        """Write list results one JSON row per line as they are encoded, other results as one JSON line"""
+        response = self.execute_response()
+        serializer = get_serializer(CommandExecutor._rows(response))
+        write = Serializer.line_writer(output_stream)
+        # enforceEx puts the matched rule in explain next to a decision; only list results have no decision
+        if response.allow is not None or not isinstance(response.explain, list):
+            write(serializer.dumps_bytes(response.to_dict()))
+        else:
+            timings = self.timings or Timings()
+            with timings.measure('serialize'):
+                for row in response.explain:
+                    write(serializer.dumps_bytes(row))
+        output_stream.flush()
+
+    def execute_response(self):
+        """Execute the command and return the result as a ResponseBody"""
         try:  
-            # Method name mapping: Java style -> Python style 
-            method_mapping = {  
-                'enforceEx': 'enforce_ex',  
-                'enforceExWithMatcher': 'enforce_ex_with_matcher',  
-                'batchEnforce': 'batch_enforce',  
-                'getAllSubjects': 'get_all_subjects',  
-                'getAllObjects': 'get_all_objects',  
-                'getAllActions': 'get_all_actions',  
-                'getAllRoles': 'get_all_roles',  
-                'getAllNamedSubjects': 'get_all_named_subjects',  
-                'getAllNamedObjects': 'get_all_named_objects',  
-                'getAllNamedActions': 'get_all_named_actions',  
-                'getAllNamedRoles': 'get_all_named_roles',  
-                'addPolicy': 'add_policy',  
-                'removePolicy': 'remove_policy',  
-                'updatePolicy': 'update_policy',  
-                'addGroupingPolicy': 'add_grouping_policy',  
-                'removeGroupingPolicy': 'remove_grouping_policy',  
-                'updateGroupingPolicy': 'update_grouping_policy',  
-                'addNamedPolicy': 'add_named_policy',  
-                'removeNamedPolicy': 'remove_named_policy',  
-                'addNamedPolicies': 'add_named_policies',  
-                'removeNamedPolicies': 'remove_named_policies',  
-                'addNamedGroupingPolicy': 'add_named_grouping_policy',  
-                'removeNamedGroupingPolicy': 'remove_named_grouping_policy',  
-                'addNamedGroupingPolicies': 'add_named_grouping_policies',  
-                'removeNamedGroupingPolicies': 'remove_named_grouping_policies',  
-                'removeFilteredPolicy': 'remove_filtered_policy',  
-                'removeFilteredNamedPolicy': 'remove_filtered_named_policy',  
-                'removeFilteredGroupingPolicy': 'remove_filtered_grouping_policy',  
-                'removeFilteredNamedGroupingPolicy': 'remove_filtered_named_grouping_policy',  
-                'hasPolicy': 'has_policy',  
-                'hasNamedPolicy': 'has_named_policy',  
-                'hasGroupingPolicy': 'has_grouping_policy',  
-                'hasNamedGroupingPolicy': 'has_named_grouping_policy',  
-                'getPolicy': 'get_policy',  
-                'getNamedPolicy': 'get_named_policy',  
-                'getGroupingPolicy': 'get_grouping_policy',  
-                'getNamedGroupingPolicy': 'get_named_grouping_policy',  
-                'getFilteredPolicy': 'get_filtered_policy',  
-                'getFilteredNamedPolicy': 'get_filtered_named_policy',  
-                'getFilteredGroupingPolicy': 'get_filtered_grouping_policy',  
-                'getFilteredNamedGroupingPolicy': 'get_filtered_named_grouping_policy',  
-                'getRolesForUser': 'get_roles_for_user',  
-                'getUsersForRole': 'get_users_for_role',  
-                'hasRoleForUser': 'has_role_for_user',  
-                'addRoleForUser': 'add_role_for_user',  
-                'deleteRoleForUser': 'delete_role_for_user',  
-                'deleteRolesForUser': 'delete_roles_for_user',  
-                'deleteUser': 'delete_user',  
-                'deleteRole': 'delete_role',  
-                'deletePermission': 'delete_permission',  
-                'addPermissionForUser': 'add_permission_for_user',  
-                'deletePermissionForUser': 'delete_permission_for_user',  
-                'deletePermissionsForUser': 'delete_permissions_for_user',  
-                'getPermissionsForUser': 'get_permissions_for_user',  
-                'hasPermissionForUser': 'has_permission_for_user',  
-                'getImplicitRolesForUser': 'get_implicit_roles_for_user',  
-                'getImplicitPermissionsForUser': 'get_implicit_permissions_for_user',  
-                'getImplicitUsersForRole': 'get_implicit_users_for_role',
-                'addPolicies': 'add_policies',  
-            }  
-              
-              
-            actual_method_name = method_mapping.get(self.command_name, self.command_name)  
-              
-
-            if not hasattr(self.enforcer, actual_method_name):      
-                available_methods = [method for method in dir(self.enforcer) if not method.startswith('_')]  
-                raise AttributeError(f"Method '{actual_method_name}' not found. Available methods: {available_methods[:10]}...")  
-  
-            method = getattr(self.enforcer, actual_method_name)  
-  
-            # Convert arguments based on method signature  
-            converted_args = self._convert_arguments(method, self.args)  
-  
+            # Single registry lookup: target method, argument converters and whether the command mutates
+            command = get_command(self.command_name)
+            method = self._resolve(command)
+
+            if self.command_name == 'batchEnforce' and self.workers > 1:
+                from .parallel import ParallelBatchEnforcer
+                method = ParallelBatchEnforcer(self.enforcer, self.workers).batch_enforce
+
+            converted_args = command.convert(self.args)
+
+            # Adapters that persist each change on their own count their writes
+            incremental_writes = getattr(getattr(self.enforcer, 'adapter', None), 'writes', None)
+
+            timings = self.timings or Timings()
+
             # Execute method  
-            result = method(*converted_args)  
+            with timings.measure('execute'):
+                result = self._call(command, method, converted_args)
   
             # Build response with standardized format  
             response = ResponseBody()  
@@ -105,7 +104,7 @@ class CommandExecutor:
                 response.explain = result[1]  
             elif isinstance(result, list):  
                 response.allow = None  
-                response.explain = result  
+                response.explain = self._paginate(result)
             elif hasattr(result, 'allow') and hasattr(result, 'explain'):  
                 # Handle EnforceResult type  
                 response.allow = result.allow  
@@ -117,24 +116,20 @@ class CommandExecutor:
 
             
   
-            # Save policy for modification operations  
-            modification_operations = [  
-                'addPolicy', 'removePolicy', 'updatePolicy',  
-                'addGroupingPolicy', 'removeGroupingPolicy', 'updateGroupingPolicy',  
-                'addNamedPolicy', 'removeNamedPolicy', 'addNamedPolicies', 'removeNamedPolicies',  
-                'addNamedGroupingPolicy', 'removeNamedGroupingPolicy', 'addNamedGroupingPolicies',  
-                'removeNamedGroupingPolicies', 'removeFilteredPolicy', 'removeFilteredNamedPolicy',  
-                'removeFilteredGroupingPolicy', 'removeFilteredNamedGroupingPolicy',  
-                'updateNamedGroupingPolicy', 'addRoleForUser', 'deleteRoleForUser', 'deleteRolesForUser',  
-                'deleteUser', 'deleteRole', 'deletePermission', 'addPermissionForUser',  
-                'deletePermissionForUser', 'deletePermissionsForUser'  
-            ]  
-              
-            if self.command_name in modification_operations:  
-                self.enforcer.save_policy()  
-  
-            # Return JSON response with consistent formatting  
-            return json.dumps(response.to_dict(), separators=(',', ':'), ensure_ascii=False)  
+            # Save policy for modification operations
+            if command.mutating:  
+                if self.decision_cache is not None:
+                    self.decision_cache.clear()
+                if self.role_index is not None:
+                    self.role_index.sync()
+                # Fall back to rewriting the whole policy unless the adapter already persisted the change,
+                # or there was no change to persist
+                persisted = incremental_writes is not None and self.enforcer.adapter.writes != incremental_writes
+                if self.save_policy and not persisted and CommandExecutor._changed(result):
+                    with timings.measure('save'):
+                        self.enforcer.save_policy()  
+  
+            return response
   
         except Exception as e:      
             import sys  
@@ -143,102 +138,76 @@ class CommandExecutor:
             else:  
                 raise Exception(f"Error executing command '{self.command_name}': {str(e)}")  
   
-    def _convert_arguments(self, method, args: List[str]) -> List[Any]:  
-        """Convert string arguments to appropriate types based on method signature"""  
-        if not args:  
-            return []
+    def _resolve(self, command):
+        """The callable behind a command: the role index fast path, the enforcer method or a CLI implementation"""
+        if self.role_index is not None and command.name in self.role_index.COMMANDS:
+            return getattr(self.role_index, self.role_index.COMMANDS[command.name])
+
+        method = getattr(self.enforcer, command.method, None)
+        if method is None and command.name in CommandExecutor.CLI_METHODS:
+            module_name, function_name = CommandExecutor.CLI_METHODS[command.name]
+            function = timed_import(module_name)
+            for name in function_name.split('.'):
+                function = getattr(function, name)
+            return partial(function, self.enforcer)
+        if method is None:
+            raise AttributeError(f"Method '{command.method}' is not provided by the installed casbin version")
+        return method
+
+    @staticmethod
+    def _changed(result):
+        """Whether a mutating command changed the policy. casbin returns False when there was nothing to add,
+        remove or update, or the list of rules it removed; the bulk commands report how many rules they changed"""
+        if result is False or result == []:
+            return False
+        if isinstance(result, dict):
+            return any(result.get(key) for key in ('added', 'removed', 'imported'))
+        return True
+
+    @staticmethod
+    def _rows(response):
+        """Number of rows in a list result, 0 for everything else"""
+        return len(response.explain) if isinstance(response.explain, list) else 0
+
+    def _paginate(self, rows: List[Any]) -> List[Any]:
+        """Select the page given by offset and limit, slicing copies only the selected rows"""
+        if self.limit is None:
+            return rows[self.offset:] if self.offset else rows
+        return rows[self.offset:self.offset + self.limit]
+
+    def _call(self, command, method, converted_args: List[Any]) -> Any:
+        """Call the enforcer method, answering enforce decisions from the decision cache when one is set"""
+        cache = self.decision_cache
+        if cache is None or not command.cacheable:
+            return method(*converted_args)
 
-      
-  
-        converted = []  
-          
-        # Handle special cases for specific method signatures 
         if self.command_name == 'batchEnforce':
-            #print(f"DEBUG: Input args: {args}")  
-            #print(f"DEBUG: Args length: {len(args)}")     
-            batch_requests = []  
-            for arg in args:
-                #print(f"DEBUG: Processing arg {i}: '{arg}'")
-                split_result = arg.split(',')  
-                #print(f"DEBUG: Split result: {split_result}")   
-                batch_requests.append(arg.split(','))
-            #print(f"DEBUG: Final batch_requests: {batch_requests}")  
-            return batch_requests 
-        '''
-        if self.command_name == 'batchEnforce':  
-            # Convert comma-separated strings to lists for batch operations
-            print(f"DEBUG: Original args: {self.args}")   
-            batch_requests = []  
-            for arg in args:  
-                if ',' in arg:  
-                    batch_requests.append(arg.split(','))
-                print(f"DEBUG: Converted requests: {batch_requests}") 
-
-                try: 
-                    result = self.enforcer.batch_enforce(batch_requests)  
-                    print(f"DEBUG: Batch enforce result: {result}")  
-                    return batch_requests   
-                except Exception as e:  
-                    print(f"DEBUG: Error in batch_enforce: {e}")  
-                    raise 
-                #else:  
-                #    batch_requests.append([arg])  
-            #return batch_requests 
-        '''
-        # Handle methods with matcher parameter  
-        if self.command_name in ['enforceWithMatcher', 'enforceExWithMatcher']:  
-            # First argument is matcher string, rest are regular parameters  
-            converted.append(args[0])  # matcher  
-            converted.extend(args[1:])  # other parameters  
-            return converted  
-  
-        # Handle JSON object parameters  
-        for i, arg in enumerate(args):  
-            if arg and arg.strip().startswith('{'):  
-                try:  
-                    converted.append(json.loads(arg))  
-                except json.JSONDecodeError:  
-                    converted.append(arg)  
-            elif arg and ',' in arg and self._should_split_as_list(self.command_name, i):  
-                # Split comma-separated values for list parameters  
-                converted.append(arg.split(','))  
-            else:  
-                # Handle type conversion for specific parameter types  
-                converted_arg = self._convert_single_argument(arg)  
-                converted.append(converted_arg)  
-  
-        return converted  
-  
-    def _should_split_as_list(self, method_name: str, arg_index: int) -> bool:  
-        """Determine if an argument should be split into a list based on method and position"""  
-        # Define methods that expect list parameters at specific positions  
-        list_methods = {  
-            'addPolicies': [0],  
-            'removePolicies': [0],  
-            'addNamedPolicies': [1],  
-            'removeNamedPolicies': [1],  
-            'addGroupingPolicies': [0],  
-            'removeGroupingPolicies': [0],  
-            'addNamedGroupingPolicies': [1],  
-            'removeNamedGroupingPolicies': [1]  
-        }  
-          
-        return method_name in list_methods and arg_index in list_methods[method_name]  
-  
-    def _convert_single_argument(self, arg: str) -> Any:  
-        """Convert a single string argument to appropriate type"""  
-        if arg is None:  
-            return None  
-              
-        # Try to convert to integer  
-        try:  
-            return int(arg)  
-        except ValueError:  
-            pass  
-              
-        # Try to convert to boolean  
-        if arg.lower() in ['true', 'false']:  
-            return arg.lower() == 'true'  
-              
-        # Return as string  
-        return arg
\ No newline at end of file
+            requests = converted_args[0]
+            keys = [('enforce', tuple(request)) for request in requests]
+            results = [None] * len(requests)
+            missing = []
+            for i, key in enumerate(keys):
+                hit, decision = cache.get(key)
+                if hit:
+                    results[i] = decision
+                else:
+                    missing.append(i)
+
+            if missing:
+                decisions = method([requests[i] for i in missing])
+                for i, decision in zip(missing, decisions):
+                    cache.put(keys[i], decision)
+                    results[i] = decision
+            return results
+
+        key = (self.command_name, tuple(converted_args))
+        try:
+            hit, decision = cache.get(key)
+        except TypeError:
+            # Requests with JSON object arguments are not hashable and bypass the cache
+            return method(*converted_args)
+
+        if not hit:
+            decision = method(*converted_args)
+            cache.put(key, decision)
+        return decision
@@ -0,0 +1,268 @@
+import json
+
+def _text(arg):
+    return arg
+
+def request_value(arg):
+    """Request values are strings, or JSON objects for ABAC attributes"""
+    if arg and arg.lstrip().startswith('{'):
+        try:
+            return json.loads(arg)
+        except json.JSONDecodeError:
+            pass
+    return arg
+
+def _rule(arg):
+    """One comma-separated rule or request"""
+    return arg.split(',')
+
+def _rules(arg):
+    """Several comma-separated rules joined by ';'"""
+    return [_rule(rule) for rule in arg.split(';')]
+
+def _chunk_size(arg):
+    try:
+        return int(arg)
+    except ValueError:
+        raise ValueError(f"Chunk size must be an integer, got '{arg}'") from None
+
+def _field_index(arg):
+    try:
+        return int(arg)
+    except ValueError:
+        raise ValueError(f"Field index must be an integer, got '{arg}'") from None
+
+# Converters that parse their argument; the client passes empty arguments as None, which they cannot take
+_PARSED = (_rule, _rules, _chunk_size, _field_index)
+
+class Param:
+    def __init__(self, name, convert=_text, variadic=False, as_list=False, optional=False):
+        """One argument of a command.
+
+        A variadic parameter takes the remaining arguments, passed on one by one or, with as_list,
+        as a single list. Optional parameters may be left out at the end.
+        """
+        self.name = name
+        self.convert = convert
+        self.variadic = variadic
+        self.as_list = as_list
+        self.optional = optional
+
+    def usage(self):
+        if self.variadic:
+            return f"[{self.name}...]" if self.optional else f"<{self.name}>..."
+        return f"[{self.name}]" if self.optional else f"<{self.name}>"
+
+class Command:
+    def __init__(self, name, method, params=(), mutating=False, cacheable=False, summary=""):
+        """A CLI command bound to an enforcer method.
+
+        mutating commands change the policy and have it persisted afterwards, cacheable ones are enforce
+        decisions that may be answered from the decision cache.
+        """
+        self.name = name
+        self.method = method
+        self.params = tuple(params)
+        self.mutating = mutating
+        self.cacheable = cacheable
+        self.summary = summary
+
+        self._fixed = tuple(param for param in self.params if not param.variadic)
+        self._required = sum(1 for param in self._fixed if not param.optional)
+        self._variadic = self.params[-1] if self.params and self.params[-1].variadic else None
+
+    def usage(self):
+        return " ".join([self.name] + [param.usage() for param in self.params])
+
+    def convert(self, args):
+        """Turn command line strings into the enforcer method's positional arguments"""
+        if len(args) < self._required:
+            raise ValueError(f"Usage: {self.usage()}")
+
+        fixed = args[:len(self._fixed)]
+        converted = [self._convert(param, arg) for param, arg in zip(self._fixed, fixed)]
+        if self._variadic is None:
+            # Surplus arguments are passed on so the enforcer method reports them
+            converted.extend(args[len(self._fixed):])
+        else:
+            rest = [self._convert(self._variadic, arg) for arg in args[len(self._fixed):]]
+            if self._variadic.as_list:
+                converted.append(rest)
+            else:
+                converted.extend(rest)
+        return converted
+
+    def _convert(self, param, arg):
+        if not arg and param.convert in _PARSED:
+            raise ValueError(f"Usage: {self.usage()}")
+        return param.convert(arg)
+
+# Reusable argument shapes
+_RVALS = (Param('rval', request_value, variadic=True),)
+_PARAMS = (Param('field', variadic=True),)
+_NAMED_PARAMS = (Param('ptype'), Param('field', variadic=True))
+_RULES = (Param('rule', _rule, variadic=True, as_list=True),)
+_NAMED_RULES = (Param('ptype'), Param('rule', _rule, variadic=True, as_list=True))
+_FILTER = (Param('fieldIndex', _field_index), Param('fieldValue', variadic=True, optional=True))
+_NAMED_FILTER = (Param('ptype'), Param('fieldIndex', _field_index), Param('fieldValue', variadic=True, optional=True))
+_PTYPE = (Param('ptype'),)
+_USER_PERMISSION = (Param('user'), Param('permission', variadic=True))
+
+_COMMANDS = [
+    # Enforcement
+    Command('enforce', 'enforce', _RVALS, cacheable=True,
+            summary="Test if a 'subject' can access an 'object' with a given 'action' based on the policy"),
+    Command('enforceEx', 'enforce_ex', _RVALS, cacheable=True,
+            summary="Check permissions and get which policy it matches"),
+    Command('batchEnforce', 'batch_enforce', (Param('request', _rule, variadic=True, as_list=True),), cacheable=True,
+            summary="Enforce many comma-separated requests at once"),
+
+    # Policy management
+    Command('getPolicy', 'get_policy', summary="Get all policy rules"),
+    Command('getNamedPolicy', 'get_named_policy', _PTYPE, summary="Get all rules of a policy type"),
+    Command('getFilteredPolicy', 'get_filtered_policy', _FILTER, summary="Get the policy rules matching a field filter"),
+    Command('getFilteredNamedPolicy', 'get_filtered_named_policy', _NAMED_FILTER,
+            summary="Get the rules of a policy type matching a field filter"),
+    Command('hasPolicy', 'has_policy', _PARAMS, summary="Check whether a policy rule exists"),
+    Command('hasNamedPolicy', 'has_named_policy', _NAMED_PARAMS, summary="Check whether a rule of a policy type exists"),
+    Command('addPolicy', 'add_policy', _PARAMS, mutating=True, summary="Add a policy rule to the policy file"),
+    Command('addPolicies', 'add_policies', _RULES, mutating=True, summary="Add comma-separated policy rules"),
+    Command('addNamedPolicy', 'add_named_policy', _NAMED_PARAMS, mutating=True,
+            summary="Add a rule of a policy type"),
+    Command('addNamedPolicies', 'add_named_policies', _NAMED_RULES, mutating=True,
+            summary="Add comma-separated rules of a policy type"),
+    Command('removePolicy', 'remove_policy', _PARAMS, mutating=True, summary="Remove a policy rule from the policy file"),
+    Command('removePolicies', 'remove_policies', _RULES, mutating=True, summary="Remove comma-separated policy rules"),
+    Command('removeNamedPolicy', 'remove_named_policy', _NAMED_PARAMS, mutating=True,
+            summary="Remove a rule of a policy type"),
+    Command('removeNamedPolicies', 'remove_named_policies', _NAMED_RULES, mutating=True,
+            summary="Remove comma-separated rules of a policy type"),
+    Command('removeFilteredPolicy', 'remove_filtered_policy', _FILTER, mutating=True,
+            summary="Remove the policy rules matching a field filter"),
+    Command('removeFilteredNamedPolicy', 'remove_filtered_named_policy', _NAMED_FILTER, mutating=True,
+            summary="Remove the rules of a policy type matching a field filter"),
+    Command('updatePolicy', 'update_policy', (Param('oldRule', _rule), Param('newRule', _rule)), mutating=True,
+            summary="Replace a comma-separated policy rule"),
+    Command('updatePolicies', 'update_policies', (Param('oldRules', _rules), Param('newRules', _rules)), mutating=True,
+            summary="Replace ';'-separated policy rules, each old rule by the new rule at its position"),
+    Command('updateNamedPolicy', 'update_named_policy', (Param('ptype'), Param('oldRule', _rule), Param('newRule', _rule)),
+            mutating=True, summary="Replace a comma-separated rule of a policy type"),
+    Command('updateNamedPolicies', 'update_named_policies',
+            (Param('ptype'), Param('oldRules', _rules), Param('newRules', _rules)), mutating=True,
+            summary="Replace ';'-separated rules of a policy type"),
+    Command('diffPolicy', 'diff_policy', (Param('policyFile'),),
+            summary="Get the rules to add and remove to match a target policy file"),
+    Command('applyPolicy', 'apply_policy', (Param('policyFile'),), mutating=True,
+            summary="Add and remove rules in one batch so the policy matches a target policy file"),
+    Command('compile', 'compile_policy', (Param('outputFile'),),
+            summary="Write the policy as a compiled snapshot that -p loads faster than CSV"),
+    Command('importPolicies', 'import_policies', (Param('file'), Param('chunkSize', _chunk_size, optional=True)),
+            mutating=True, summary="Add the rules of a policy CSV or NDJSON file in chunks and save the policy once"),
+
+    # Grouping policies
+    Command('getGroupingPolicy', 'get_grouping_policy', summary="Get all role inheritance rules"),
+    Command('getNamedGroupingPolicy', 'get_named_grouping_policy', _PTYPE,
+            summary="Get all role inheritance rules of a grouping type"),
+    Command('getFilteredGroupingPolicy', 'get_filtered_grouping_policy', _FILTER,
+            summary="Get the role inheritance rules matching a field filter"),
+    Command('getFilteredNamedGroupingPolicy', 'get_filtered_named_grouping_policy', _NAMED_FILTER,
+            summary="Get the rules of a grouping type matching a field filter"),
+    Command('hasGroupingPolicy', 'has_grouping_policy', _PARAMS, summary="Check whether a role inheritance rule exists"),
+    Command('hasNamedGroupingPolicy', 'has_named_grouping_policy', _NAMED_PARAMS,
+            summary="Check whether a rule of a grouping type exists"),
+    Command('addGroupingPolicy', 'add_grouping_policy', _PARAMS, mutating=True, summary="Add a role inheritance rule"),
+    Command('addGroupingPolicies', 'add_grouping_policies', _RULES, mutating=True,
+            summary="Add comma-separated role inheritance rules"),
+    Command('addNamedGroupingPolicy', 'add_named_grouping_policy', _NAMED_PARAMS, mutating=True,
+            summary="Add a rule of a grouping type"),
+    Command('addNamedGroupingPolicies', 'add_named_grouping_policies', _NAMED_RULES, mutating=True,
+            summary="Add comma-separated rules of a grouping type"),
+    Command('removeGroupingPolicy', 'remove_grouping_policy', _PARAMS, mutating=True,
+            summary="Remove a role inheritance rule"),
+    Command('removeGroupingPolicies', 'remove_grouping_policies', _RULES, mutating=True,
+            summary="Remove comma-separated role inheritance rules"),
+    Command('removeNamedGroupingPolicy', 'remove_named_grouping_policy', _NAMED_PARAMS, mutating=True,
+            summary="Remove a rule of a grouping type"),
+    Command('removeNamedGroupingPolicies', 'remove_named_grouping_policies', _NAMED_RULES, mutating=True,
+            summary="Remove comma-separated rules of a grouping type"),
+    Command('removeFilteredGroupingPolicy', 'remove_filtered_grouping_policy', _FILTER, mutating=True,
+            summary="Remove the role inheritance rules matching a field filter"),
+    Command('removeFilteredNamedGroupingPolicy', 'remove_filtered_named_grouping_policy', _NAMED_FILTER, mutating=True,
+            summary="Remove the rules of a grouping type matching a field filter"),
+
+    # Data retrieval
+    Command('getAllSubjects', 'get_all_subjects', summary="Get the subjects that appear in the policy"),
+    Command('getAllObjects', 'get_all_objects', summary="Get the objects that appear in the policy"),
+    Command('getAllActions', 'get_all_actions', summary="Get the actions that appear in the policy"),
+    Command('getAllRoles', 'get_all_roles', summary="Get the roles that appear in the grouping policy"),
+    Command('getAllNamedSubjects', 'get_all_named_subjects', _PTYPE,
+            summary="Get the subjects of a policy type"),
+    Command('getAllNamedObjects', 'get_all_named_objects', _PTYPE, summary="Get the objects of a policy type"),
+    Command('getAllNamedActions', 'get_all_named_actions', _PTYPE, summary="Get the actions of a policy type"),
+    Command('getAllNamedRoles', 'get_all_named_roles', _PTYPE, summary="Get the roles of a grouping type"),
+
+    # RBAC
+    Command('getRolesForUser', 'get_roles_for_user', (Param('user'),), summary="Get the roles a user has"),
+    Command('getUsersForRole', 'get_users_for_role', (Param('role'),), summary="Get the users that have a role"),
+    Command('hasRoleForUser', 'has_role_for_user', (Param('user'), Param('role')),
+            summary="Check whether a user has a role"),
+    Command('addRoleForUser', 'add_role_for_user', (Param('user'), Param('role')), mutating=True,
+            summary="Give a user a role"),
+    Command('deleteRoleForUser', 'delete_role_for_user', (Param('user'), Param('role')), mutating=True,
+            summary="Take a role away from a user"),
+    Command('deleteRolesForUser', 'delete_roles_for_user', (Param('user'),), mutating=True,
+            summary="Take all roles away from a user"),
+    Command('deleteUser', 'delete_user', (Param('user'),), mutating=True, summary="Remove a user from the policy"),
+    Command('deleteRole', 'delete_role', (Param('role'),), mutating=True, summary="Remove a role from the policy"),
+    Command('deletePermission', 'delete_permission', (Param('permission', variadic=True),), mutating=True,
+            summary="Remove a permission from the policy"),
+    Command('addPermissionForUser', 'add_permission_for_user', _USER_PERMISSION, mutating=True,
+            summary="Give a user or role a permission"),
+    Command('deletePermissionForUser', 'delete_permission_for_user', _USER_PERMISSION, mutating=True,
+            summary="Take a permission away from a user or role"),
+    Command('deletePermissionsForUser', 'delete_permissions_for_user', (Param('user'),), mutating=True,
+            summary="Take all permissions away from a user or role"),
+    Command('getPermissionsForUser', 'get_permissions_for_user', (Param('user'),),
+            summary="Get the permissions of a user or role"),
+    Command('hasPermissionForUser', 'has_permission_for_user', _USER_PERMISSION,
+            summary="Check whether a user or role has a permission"),
+    Command('getImplicitRolesForUser', 'get_implicit_roles_for_user', (Param('user'), Param('domain', optional=True)),
+            summary="Get the roles a user has directly or through inheritance"),
+    Command('getImplicitPermissionsForUser', 'get_implicit_permissions_for_user',
+            (Param('user'), Param('domain', optional=True)),
+            summary="Get the permissions a user has directly or through roles"),
+    Command('getImplicitUsersForRole', 'get_implicit_users_for_role', (Param('role'),),
+            summary="Get the users that have a role directly or through inheritance"),
+    Command('getImplicitUsersForPermission', 'get_implicit_users_for_permission', (Param('permission', variadic=True),),
+            summary="Get the users that have a permission directly or through roles"),
+    Command('getNamedImplicitPermissionsForUser', 'get_named_implicit_permissions_for_user',
+            (Param('ptype'), Param('user'), Param('domain', optional=True)),
+            summary="Get the permissions of a policy type a user has directly or through roles"),
+
+    # RBAC with domains
+    Command('getRolesForUserInDomain', 'get_roles_for_user_in_domain', (Param('user'), Param('domain')),
+            summary="Get the roles a user has in a domain"),
+    Command('getUsersForRoleInDomain', 'get_users_for_role_in_domain', (Param('role'), Param('domain')),
+            summary="Get the users that have a role in a domain"),
+    Command('getAllRolesByDomain', 'get_all_roles_by_domain', (Param('domain'),),
+            summary="Get the roles that appear in a domain"),
+    Command('addRoleForUserInDomain', 'add_role_for_user_in_domain', (Param('user'), Param('role'), Param('domain')),
+            mutating=True, summary="Give a user a role in a domain"),
+    Command('deleteRolesForUserInDomain', 'delete_roles_for_user_in_domain',
+            (Param('user'), Param('role'), Param('domain')), mutating=True,
+            summary="Take a role in a domain away from a user"),
+    Command('getPermissionsForUserInDomain', 'get_permissions_for_user_in_domain', (Param('user'), Param('domain')),
+            summary="Get the permissions of a user or role in a domain"),
+    Command('getNamedPermissionsForUserInDomain', 'get_named_permissions_for_user_in_domain',
+            (Param('ptype'), Param('user'), Param('domain')),
+            summary="Get the permissions of a policy type a user or role has in a domain"),
+]
+
+COMMANDS = {command.name: command for command in _COMMANDS}
+
+def get_command(name):
+    """Look up a command by its CLI name"""
+    command = COMMANDS.get(name)
+    if command is None:
+        raise ValueError(f"Unknown command '{name}', run with --help for the list of commands")
+    return command
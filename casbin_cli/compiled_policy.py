@@ -0,0 +1,183 @@
+import gc
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from casbin.persist.adapter import Adapter
+from casbin.rbac.default_role_manager.role_manager import RoleManager
+from .utils import COMPILED_POLICY_MAGIC as MAGIC, is_compiled_policy as is_compiled
+
+# File layout, all integers little-endian uint32:
+#   MAGIC, string count, string table byte length, NUL-separated UTF-8 string table,
+#   run count, then per run: ptype string id, rule width, rule count, rule count * width string ids.
+# A run is a stretch of rules of one policy type and width, so the policy order is kept exactly.
+_HEADER = struct.Struct('<II')
+_RUN = struct.Struct('<III')
+
+def compile_policy(enforcer, path):
+    """Write the enforcer's policy as a compiled snapshot to path"""
+    start = time.perf_counter()
+    strings, rules = write_snapshot(enforcer.get_model(), path)
+    return {
+        "rules": rules,
+        "strings": strings,
+        "bytes": os.path.getsize(path),
+        "elapsedMs": round((time.perf_counter() - start) * 1000, 4)
+    }
+
+def write_snapshot(model, path):
+    """Encode every rule of the model, replacing path atomically; returns the string and rule counts"""
+    ids = {}
+    runs = []
+    for sec in ('p', 'g'):
+        for ptype, assertion in model.model.get(sec, {}).items():
+            ptype_id = ids.setdefault(ptype, len(ids))
+            run = None
+            for rule in assertion.policy:
+                if run is None or len(rule) != run[1]:
+                    run = [ptype_id, len(rule), 0, array('I')]
+                    runs.append(run)
+                run[2] += 1
+                run[3].extend([ids.setdefault(value, len(ids)) for value in rule])
+
+    if any('\0' in value for value in ids):
+        raise ValueError("Policy values containing NUL characters cannot be compiled")
+    table = '\0'.join(ids).encode('utf-8')
+
+    # Written next to the target and renamed over it, with the usual permissions for a new file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(len(ids), len(table)))
+            f.write(table)
+            f.write(struct.pack('<I', len(runs)))
+            for ptype_id, width, count, values in runs:
+                f.write(_RUN.pack(ptype_id, width, count))
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                f.write(values.tobytes())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return len(ids), sum(run[2] for run in runs)
+
+def read_snapshot(path):
+    """[(ptype, rules)] runs of a compiled snapshot, every occurrence of a value sharing one string object"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        view = memoryview(data)
+        try:
+            if view[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a compiled policy")
+            offset = len(MAGIC)
+            string_count, table_size = _HEADER.unpack_from(view, offset)
+            offset += _HEADER.size
+            strings = bytes(view[offset:offset + table_size]).decode('utf-8').split('\0') if string_count else []
+            if len(strings) != string_count:
+                raise ValueError(f"{path} has a corrupt string table")
+            offset += table_size
+            (run_count,) = struct.unpack_from('<I', view, offset)
+            offset += 4
+
+            runs = []
+            for _ in range(run_count):
+                ptype_id, width, count = _RUN.unpack_from(view, offset)
+                offset += _RUN.size
+                size = width * count * 4
+                if offset + size > len(view):
+                    raise ValueError(f"{path} is truncated")
+                values = array('I')
+                values.frombytes(view[offset:offset + size])
+                offset += size
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                # Group the flat ids into rules without a Python-level loop
+                tokens = iter(map(strings.__getitem__, values))
+                rules = list(map(list, zip(*[tokens] * width))) if width else [[] for _ in range(count)]
+                runs.append((strings[ptype_id], rules))
+        except (struct.error, IndexError):
+            raise ValueError(f"{path} is not a valid compiled policy") from None
+        finally:
+            view.release()
+    return runs
+
+class CompiledPolicyAdapter(Adapter):
+    def __init__(self, file_path):
+        """Load the policy from a snapshot written by the compile command.
+
+        Changes are not written one by one; saving the policy writes a new snapshot.
+        """
+        self.file_path = file_path
+
+    def new_enforcer(self, enforcer_class, model):
+        """Enforcer with the snapshot loaded.
+
+        Equivalent to enforcer_class(model, self) without the parts of casbin's load that only matter on
+        a reload: the model is not copied and the role graph is not logged. Garbage collection is paused meanwhile; everything created is kept,
+        so collections would only walk the growing policy again and again.
+        """
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            return self._new_enforcer(enforcer_class, model)
+        finally:
+            if paused:
+                gc.enable()
+
+    def _new_enforcer(self, enforcer_class, model):
+        enforcer = enforcer_class(model, None)
+        model = enforcer.get_model()
+        self.load_policy(model)
+        model.sort_policies_by_subject_hierarchy()
+        model.sort_policies_by_priority()
+        for ptype, assertion in model.model.get('g', {}).items():
+            rm = enforcer.rm_map.get(ptype)
+            if rm is None:
+                continue
+            if type(rm) is RoleManager and rm.matching_func is None and assertion.value.count('_') == 2:
+                _build_role_links(assertion, rm)
+            else:
+                assertion.build_role_links(rm)
+        if enforcer.cond_rm_map:
+            model.build_conditional_role_links(enforcer.cond_rm_map)
+        enforcer.set_adapter(self)
+        return enforcer
+
+    def load_policy(self, model):
+        """Append every rule of the snapshot, skipping policy types the model does not define like the CSV loader"""
+        for ptype, rules in read_snapshot(self.file_path):
+            assertion = model.model.get(ptype[:1], {}).get(ptype)
+            if assertion is not None:
+                assertion.policy.extend(rules)
+
+    def save_policy(self, model):
+        write_snapshot(model, self.file_path)
+        return True
+
+    # Batch operations must exist for casbin to accept batch changes; save_policy persists them
+    def add_policies(self, sec, ptype, rules):
+        return True
+
+    def remove_policies(self, sec, ptype, rules):
+        return True
+
+    def update_policy(self, sec, ptype, old_rule, new_rule):
+        return True
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        return True
+
+def _build_role_links(assertion, rm):
+    """assertion.build_role_links(rm) for rules without domains, without logging the whole role graph"""
+    add_link = rm.add_link
+    for rule in assertion.policy:
+        if len(rule) < 2:
+            raise RuntimeError("grouping policy elements do not meet role definition")
+        add_link(rule[0], rule[1])
+    assertion.rm = rm
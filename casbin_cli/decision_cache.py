@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+
+DEFAULT_DECISION_CACHE_SIZE = 10000
+
+class DecisionCache:
+    def __init__(self, max_size=DEFAULT_DECISION_CACHE_SIZE, ttl=None):
+        """LRU cache of enforce decisions with an optional time-to-live in seconds"""
+        if max_size < 1:
+            raise ValueError("Decision cache size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Decision cache TTL must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return (True, decision) on a hit and (False, None) on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            decision, expires_at = entry
+            if expires_at is None or time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, decision
+            del self._entries[key]
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key, decision):
+        """Store a decision, evicting the least recently used one when full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (decision, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached decision, called whenever the policy changes"""
+        self._entries.clear()
+
+    def stats(self):
+        """Size and hit/miss counters"""
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
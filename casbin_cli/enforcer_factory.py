@@ -1,34 +1,95 @@
 import casbin  
 import os  
-import tempfile  
+from .utils import is_compiled_policy
   
 class EnforcerFactory:  
     @staticmethod  
-    def create_enforcer(model_input, policy_input):  
-        """Casbin Enforcer"""  
-        model_path = EnforcerFactory._process_input(model_input, is_model=True)  
-        policy_path = EnforcerFactory._process_input(policy_input, is_model=False)  
-          
-        return casbin.Enforcer(model_path, policy_path)  
+    def create_enforcer(model_input, policy_input, cache_dir=None, cache_size=None, index=False):  
+        """Casbin Enforcer, optionally restored from a snapshot cache in cache_dir.
+
+        With index, enforce only evaluates the rules a policy index finds for the request.
+        """
+        model_is_file, model_value = EnforcerFactory._process_input(model_input, is_model=True)
+        policy_is_file, policy_value = EnforcerFactory._process_input(policy_input, is_model=False)
+        adapter = EnforcerFactory._load_adapter(policy_is_file, policy_value)
+        enforcer_class = casbin.Enforcer
+        if index:
+            from .policy_index import IndexedEnforcer
+            enforcer_class = IndexedEnforcer
+
+        if cache_dir is None:
+            return EnforcerFactory._new_enforcer(enforcer_class, EnforcerFactory._load_model(model_is_file, model_value),
+                                                 adapter)
+
+        from .policy_cache import PolicyCache
+        cache = PolicyCache(cache_dir, cache_size)
+        key = PolicyCache.key(model_is_file, model_value, policy_is_file, policy_value)
+        enforcer = cache.load(key, adapter, enforcer_class)
+        if enforcer is None:
+            enforcer = EnforcerFactory._new_enforcer(
+                enforcer_class, EnforcerFactory._load_model(model_is_file, model_value), adapter)
+            cache.store(key, enforcer)
+        return enforcer
+
+    @staticmethod
+    def create_inline_enforcer(model_text, policy_text):
+        """Casbin Enforcer for model and policy text sent over the network, never read from the filesystem"""
+        if not isinstance(model_text, str) or not EnforcerFactory._is_valid_model_content(model_text):
+            raise ValueError("Invalid model format")
+        policy_text = policy_text or ""
+        if not isinstance(policy_text, str) or not EnforcerFactory._is_valid_policy_content(policy_text):
+            raise ValueError("Invalid policy format")
+        from .string_adapter import StringAdapter
+        return casbin.Enforcer(EnforcerFactory._load_model(False, model_text), StringAdapter(policy_text))
+
+    @staticmethod
+    def _load_model(is_file, value):
+        """Model files are read by casbin, inline model text is parsed in memory"""
+        if is_file:
+            return value
+
+        model = casbin.Model()
+        model.load_model_from_text(value)
+        return model
+
+    @staticmethod
+    def _new_enforcer(enforcer_class, model, adapter):
+        """Compiled snapshots load themselves, skipping work casbin only needs when reloading"""
+        if hasattr(adapter, 'new_enforcer'):
+            return adapter.new_enforcer(enforcer_class, model)
+        return enforcer_class(model, adapter)
+
+    @staticmethod
+    def _load_adapter(is_file, value):
+        """Policy files get an incrementally persisting file adapter, compiled snapshots their own loader,
+        inline policy text an in-memory adapter"""
+        if is_file and is_compiled_policy(value):
+            from .compiled_policy import CompiledPolicyAdapter
+            return CompiledPolicyAdapter(value)
+        if is_file:
+            from .append_file_adapter import AppendFileAdapter
+            return AppendFileAdapter(value)
+        from .string_adapter import StringAdapter
+        return StringAdapter(value)
       
     @staticmethod  
     def _process_input(input_str, is_model=True):  
-        """Processing input can be file paths or inline content"""  
+        """Processing input can be file paths or inline content, returns (is_file, path_or_content)"""
         if input_str is None:  
             raise ValueError("Input cannot be null")  
         
 
             # Empty string policy content is allowed, but None is not  
         if input_str.strip() == "" and not is_model:  
-            # For empty policy content, create a temporary file containing empty content  
-            return EnforcerFactory._write_to_temp_file("")
+            # For empty policy content, load an empty in-memory policy
+            return False, ""
           
         elif input_str.strip() == "" and is_model:  
             raise ValueError("Model content cannot be empty") 
           
         # Check if it is an existing file  
         if os.path.exists(input_str) and os.path.isfile(input_str):  
-            return input_str  
+            return True, input_str
           
         # Verification content format  
         if is_model:  
@@ -38,8 +99,8 @@ class EnforcerFactory:
             if input_str.strip() and not EnforcerFactory._is_valid_policy_content(input_str):  
                 raise ValueError("Invalid policy format")  
           
-        # Write to a temporary file  
-        return EnforcerFactory._write_to_temp_file(input_str)  
+        # Inline content is kept in memory
+        return False, EnforcerFactory._process_delimiter(input_str)
       
     @staticmethod  
     def _is_valid_model_content(content):  
@@ -57,12 +118,7 @@ class EnforcerFactory:
         return all(line.strip().startswith(('p,', 'g,')) or not line.strip()   
                   for line in lines)  
       
-    @staticmethod  
-    def _write_to_temp_file(content):  
-        """Write the content to a temporary file"""  
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.conf') as f:  
-            # Handle the delimiter  
-            processed_content = content.replace('|', '\n')  
-            f.write(processed_content)
-            f.flush()  
-            return f.name
\ No newline at end of file
+    @staticmethod
+    def _process_delimiter(content):
+        """Inline content may use '|' as the line delimiter"""
+        return content.replace('|', '\n')
\ No newline at end of file
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from .enforcer_factory import EnforcerFactory
+
+DEFAULT_POOL_SIZE = 32
+
+class _Entry:
+    def __init__(self, enforcer):
+        self.enforcer = enforcer
+        self.rules = EnforcerPool.count_rules(enforcer)
+        # Commands on one enforcer run one at a time, different tenants in parallel
+        self.lock = threading.Lock()
+
+class EnforcerPool:
+    def __init__(self, max_entries=DEFAULT_POOL_SIZE, max_rules=None):
+        """LRU pool of enforcers built from inline model and policy text, keyed by a hash of the content.
+
+        max_rules bounds the policy rules held across all entries, which is what an enforcer's memory
+        grows with. The most recently used entry is always kept, even if it alone exceeds max_rules.
+        """
+        if max_entries < 1:
+            raise ValueError("Enforcer pool size must be at least 1")
+        if max_rules is not None and max_rules < 1:
+            raise ValueError("Enforcer pool rule limit must be at least 1")
+        self.max_entries = max_entries
+        self.max_rules = max_rules
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._rules = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_text, policy_text):
+        """Content hash identifying a model and policy pair"""
+        if not isinstance(model_text, str) or not isinstance(policy_text or "", str):
+            raise ValueError("Model and policy must be inline text")
+        digest = hashlib.sha256()
+        digest.update(model_text.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update((policy_text or "").encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def count_rules(enforcer):
+        model = enforcer.get_model().model
+        return sum(len(assertion.policy) for sec in ('p', 'g') for assertion in model.get(sec, {}).values())
+
+    @contextmanager
+    def lease(self, model_text, policy_text):
+        """Use the pooled enforcer for this content, building it on a miss"""
+        entry = self._get(model_text, policy_text)
+        with entry.lock:
+            yield entry.enforcer
+
+    def stats(self):
+        """Size, limits and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_entries,
+                "rules": self._rules,
+                "maxRules": self.max_rules,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None
+            }
+
+    def _get(self, model_text, policy_text):
+        key = EnforcerPool.key(model_text, policy_text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Build outside the pool lock so other tenants are not held up; a concurrent miss may build twice
+        entry = _Entry(EnforcerFactory.create_inline_enforcer(model_text, policy_text))
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = entry
+            self._rules += entry.rules
+            self._evict()
+        return entry
+
+    def _evict(self):
+        """Drop least recently used entries until both limits hold"""
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or
+                (self.max_rules is not None and self._rules > self.max_rules)):
+            _, entry = self._entries.popitem(last=False)
+            self._rules -= entry.rules
+            self.evictions += 1
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import socket
+import threading
+from http import HTTPStatus
+from .command_executor import CommandExecutor
+from .commands import COMMANDS
+from .enforcer_factory import EnforcerFactory
+from .enforcer_pool import EnforcerPool
+from .response import ResponseBody
+from .serializer import get_serializer
+from .session import Session
+
+# Inline models and policies are far smaller than this
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Commands that read or write files named in their arguments, which HTTP clients must not do
+LOCAL_COMMANDS = ('diffPolicy', 'applyPolicy', 'importPolicies', 'compile')
+
+class _HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class HttpCommandServer:
+    def __init__(self, session, host='127.0.0.1', port=8080, allow_origin=None, pool=None):
+        """Answer POST /<command> requests with the usual JSON response, many connections on one event loop.
+
+        The body is a JSON array of arguments, or an object with "args" and optionally inline "model" and
+        "policy" text to evaluate against instead of the session's enforcer. Enforcers for such requests
+        are reused from the EnforcerPool. Commands run on a thread pool so that slow ones do not hold up
+        other connections. allow_origin enables CORS for browser clients.
+        """
+        self.session = session
+        self.allow_origin = allow_origin
+        self.pool = pool or EnforcerPool()
+
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(128)
+
+        self._loop = None
+        self._stopped = None
+        self._ready = threading.Event()
+
+    @property
+    def address(self):
+        """The bound (host, port) pair"""
+        return self.socket.getsockname()[:2]
+
+    def serve_forever(self):
+        """Handle requests until shutdown() is called or the process is interrupted"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._loop.close()
+            self.close()
+
+    def shutdown(self):
+        """Stop a serve_forever() loop running in another thread"""
+        self._ready.wait()
+        self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def close(self):
+        """Release the listening socket"""
+        self.socket.close()
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle, sock=self.socket)
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Serve the requests of one connection, keeping it open between requests unless asked not to"""
+        try:
+            while True:
+                try:
+                    request = await HttpCommandServer._read_request(reader)
+                except _HttpError as e:
+                    writer.write(self._format_response(e.status, Session.error_response(e), False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(self._format_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """(method, target, version, headers, body), None once the client closed the connection"""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise _HttpError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise _HttpError(411, "Chunked request bodies are not supported, send Content-Length")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise _HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise _HttpError(413, f"Request body exceeds {MAX_BODY_SIZE} bytes")
+
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method, target, version, headers, body
+
+    async def _dispatch(self, method, target, body):
+        """(status, JSON payload) for one request"""
+        if method == 'OPTIONS' and self.allow_origin is not None:
+            return 204, None
+        if method != 'POST':
+            return 405, Session.error_response("Only POST requests are supported")
+
+        command_name = target.split('?', 1)[0].strip('/')
+        if command_name not in COMMANDS and command_name not in ('decisionCacheStats', 'enforcerPoolStats'):
+            return 404, Session.error_response(f"Unknown command '{command_name}'")
+        if command_name in LOCAL_COMMANDS:
+            return 403, Session.error_response(f"Command '{command_name}' works on local files and is not available over HTTP")
+
+        loop = asyncio.get_event_loop()
+        try:
+            return 200, await loop.run_in_executor(None, self._execute, command_name, body)
+        except Exception as e:
+            return 400, Session.error_response(e)
+
+    def _execute(self, command_name, body):
+        """Run one command on a worker thread"""
+        try:
+            request = json.loads(body.decode('utf-8')) if body.strip() else []
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON request: {e}")
+        if isinstance(request, list):
+            request = {'args': request}
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON array of arguments or a JSON object")
+
+        if command_name == 'enforcerPoolStats':
+            return get_serializer().dumps(ResponseBody(explain=self.pool.stats()).to_dict())
+
+        args = Session.parse_args(request.get('args'))
+        if request.get('model') is None:
+            return self.session.execute(command_name, args)
+
+        # A changed enforcer no longer matches its content hash, so mutations get one of their own
+        command = COMMANDS.get(command_name)
+        if command is not None and command.mutating:
+            enforcer = EnforcerFactory.create_inline_enforcer(request['model'], request.get('policy'))
+            return CommandExecutor(enforcer, command_name, args).execute()
+        with self.pool.lease(request['model'], request.get('policy')) as enforcer:
+            return CommandExecutor(enforcer, command_name, args).execute()
+
+    def _format_response(self, status, payload, keep_alive):
+        status = HTTPStatus(status)
+        body = payload.encode('utf-8') if payload is not None else b''
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if payload is not None:
+            lines.append("Content-Type: application/json; charset=utf-8")
+        if self.allow_origin is not None:
+            lines.append(f"Access-Control-Allow-Origin: {self.allow_origin}")
+            lines.append("Access-Control-Allow-Methods: POST, OPTIONS")
+            lines.append("Access-Control-Allow-Headers: Content-Type")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import casbin
+from .__version__ import __version__
+
+DEFAULT_CACHE_SIZE = 32
+
+class PolicyCache:
+    def __init__(self, cache_dir, max_entries=None):
+        """On-disk snapshots of loaded models, policies and role graphs keyed by content hash.
+
+        Snapshots are pickles, so the cache directory is created private to the current user, and an existing
+        directory that another user owns or can write to is refused: a snapshot planted there would run code.
+        """
+        if max_entries is None:
+            max_entries = DEFAULT_CACHE_SIZE
+        if max_entries < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        PolicyCache._check_private(cache_dir)
+
+    @staticmethod
+    def key(model_is_file, model_value, policy_is_file, policy_value):
+        """Hash the model content and the policy content or its path, mtime and size"""
+        digest = hashlib.sha256()
+        # Snapshots are only valid for the same CLI, pycasbin install and Python version
+        casbin_identity = f"{casbin.__file__}|{os.stat(casbin.__file__).st_mtime_ns}"
+        digest.update(f"{__version__}|{casbin_identity}|{sys.version_info[:2]}".encode('utf-8'))
+
+        if model_is_file:
+            with open(model_value, 'rb') as f:
+                digest.update(b'model-file\0' + f.read())
+        else:
+            digest.update(b'model-text\0' + model_value.encode('utf-8'))
+
+        if policy_is_file:
+            stat = os.stat(policy_value)
+            identity = f"{os.path.abspath(policy_value)}|{stat.st_mtime_ns}|{stat.st_size}"
+            digest.update(b'\0policy-file\0' + identity.encode('utf-8'))
+        else:
+            digest.update(b'\0policy-text\0' + policy_value.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def load(self, key, adapter, enforcer_class=casbin.Enforcer):
+        """Rebuild an enforcer from a snapshot, returns None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A truncated or incompatible snapshot is treated as a miss
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        return PolicyCache.restore(snapshot, adapter, enforcer_class)
+
+    def store(self, key, enforcer):
+        """Snapshot a freshly loaded enforcer and evict the least recently used entries"""
+        snapshot = PolicyCache.snapshot(enforcer)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            self._remove(temp_path)
+            raise
+        self._evict()
+
+    @staticmethod
+    def snapshot(enforcer):
+        """The picklable state of a loaded enforcer: model with policy, and role managers"""
+        return enforcer.get_model(), enforcer.rm_map, enforcer.cond_rm_map or {}
+
+    @staticmethod
+    def restore(snapshot, adapter, enforcer_class=casbin.Enforcer):
+        """Rebuild an enforcer from snapshot() without reloading the policy"""
+        model, rm_map, cond_rm_map = snapshot
+        enforcer = enforcer_class(model, None)
+        enforcer.rm_map = rm_map
+        enforcer.cond_rm_map = cond_rm_map
+        for ptype, rm in rm_map.items():
+            model["g"][ptype].rm = rm
+        for ptype, cond_rm in cond_rm_map.items():
+            model["g"][ptype].cond_rm = cond_rm
+        enforcer.set_adapter(adapter)
+        return enforcer
+
+    def _evict(self):
+        """Keep at most max_entries snapshots, dropping the oldest by access time"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entries.append((os.stat(path).st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            self._remove(path)
+
+    @staticmethod
+    def _check_private(cache_dir):
+        if not hasattr(os, 'getuid'):
+            # Windows has no POSIX owner or mode bits to check
+            return
+        stat = os.stat(cache_dir)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            raise ValueError(f"Cache directory {cache_dir} must be owned by the current user and not writable by others")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pickle')
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
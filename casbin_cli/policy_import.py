@@ -0,0 +1,93 @@
+import json
+import sys
+import time
+from collections import defaultdict
+from .policy_diff import append_rules, current_rules, parse_rule
+
+DEFAULT_CHUNK_SIZE = 10000
+
+def import_policies(enforcer, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the rules of a CSV or NDJSON file into the enforcer chunk by chunk.
+
+    Every row is checked against the number of fields its policy type defines. Rules the policy already
+    holds are skipped. Nothing is persisted here; the caller saves the policy once, and a failing row
+    restores the policy as it was before the import.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    model = enforcer.get_model().model
+    fields = {ptype: len(assertion.tokens) for sec in ('p', 'g') for ptype, assertion in model.get(sec, {}).items()}
+    existing = set(current_rules(enforcer))
+    progress = sys.stderr.isatty()
+
+    start = time.perf_counter()
+    rows = 0
+    imported = 0
+    chunk = []
+    try:
+        for line_number, rule in _read_rows(path):
+            expected = fields.get(rule[0])
+            if expected is None:
+                raise ValueError(f"{path}:{line_number}: policy type '{rule[0]}' is not defined by the model")
+            # Grouping rules may carry extra condition arguments after the role definition's fields
+            if len(rule) - 1 != expected and not (rule[0].startswith('g') and len(rule) - 1 > expected):
+                raise ValueError(f"{path}:{line_number}: policy type '{rule[0]}' has {expected} fields, "
+                                 f"got {len(rule) - 1}")
+            rows += 1
+            chunk.append(rule)
+            if len(chunk) >= chunk_size:
+                imported += _insert(enforcer, chunk, existing)
+                chunk = []
+                if progress:
+                    print(f"\rImported {rows} rows ({_rate(rows, start)} rows/sec)", end='', file=sys.stderr)
+        imported += _insert(enforcer, chunk, existing)
+    except Exception:
+        enforcer.load_policy()
+        raise
+    finally:
+        if progress and rows >= chunk_size:
+            print(file=sys.stderr)
+
+    return {
+        "rows": rows,
+        "imported": imported,
+        "skipped": rows - imported,
+        "elapsedMs": round((time.perf_counter() - start) * 1000, 4),
+        "rowsPerSec": _rate(rows, start)
+    }
+
+def _read_rows(path):
+    """(line number, (ptype, field, ...)) for every rule of a policy CSV, or an NDJSON file of JSON arrays"""
+    ndjson = path.endswith(('.ndjson', '.jsonl'))
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not ndjson:
+                rule = parse_rule(line)
+                if rule is not None:
+                    yield line_number, rule
+                continue
+
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from None
+            if not isinstance(row, list) or not row or not all(isinstance(value, str) for value in row):
+                raise ValueError(f"{path}:{line_number}: expected a JSON array of strings starting with the policy type")
+            yield line_number, tuple(row)
+
+def _insert(enforcer, chunk, existing):
+    """Add the new rules of a chunk in one batch per policy type"""
+    by_ptype = defaultdict(list)
+    for rule in chunk:
+        if rule not in existing:
+            existing.add(rule)
+            by_ptype[rule[0]].append(list(rule[1:]))
+    for ptype, rules in by_ptype.items():
+        append_rules(enforcer, ptype, rules)
+    return sum(len(rules) for rules in by_ptype.values())
+
+def _rate(rows, start):
+    elapsed = time.perf_counter() - start
+    return round(rows / elapsed, 2) if elapsed > 0 else None
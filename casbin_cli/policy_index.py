@@ -0,0 +1,162 @@
+import ast
+import re
+import casbin
+from casbin.effect import Effector, effect_to_bool
+from casbin.core_enforcer import EnforceContext
+
+# Quoted strings in a matcher, which must survive the operator rewrite below unchanged
+_STRING = re.compile(r'"[^"]*"|\'[^\']*\'')
+
+def equality_conditions(matcher, r_tokens, p_tokens):
+    """[(policy column, request column or None, constant)] for every `p_x == r_y` or `p_x == "const"`
+    that must hold for the matcher to be true, None when the matcher cannot be analyzed.
+
+    Only comparisons joined by && at the top level qualify; anything under ||, ! or a function call is
+    left to the matcher.
+    """
+    if any(c in literal for literal in _STRING.findall(matcher) for c in '&|!'):
+        return None
+    expression = matcher.replace('&&', ' and ').replace('||', ' or ')
+    expression = re.sub(r'!(?!=)', ' not ', expression)
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError:
+        return None
+
+    conjuncts = []
+    pending = [tree.body]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            pending.extend(node.values)
+        else:
+            conjuncts.append(node)
+
+    p_columns = {token: i for i, token in enumerate(p_tokens)}
+    r_columns = {token: i for i, token in enumerate(r_tokens)}
+    conditions = []
+    for node in conjuncts:
+        if not (isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)):
+            continue
+        left, right = node.left, node.comparators[0]
+        if not (isinstance(left, ast.Name) and left.id in p_columns):
+            left, right = right, left
+        if not (isinstance(left, ast.Name) and left.id in p_columns):
+            continue
+        if isinstance(right, ast.Name) and right.id in r_columns:
+            conditions.append((p_columns[left.id], r_columns[right.id], None))
+        elif isinstance(right, ast.Constant) and isinstance(right.value, str):
+            conditions.append((p_columns[left.id], None, right.value))
+    return sorted(set(conditions), key=repr) or None
+
+class _PolicyIndex:
+    def __init__(self, policy, conditions):
+        """Rules grouped by the values of the columns the matcher compares for equality, in policy order"""
+        self.policy = policy
+        self.conditions = conditions
+        self.rows = {}
+        for rule in policy if conditions else ():
+            key = tuple(rule[column] for column, _, _ in conditions)
+            self.rows.setdefault(key, []).append(rule)
+
+class IndexedEnforcer(casbin.Enforcer):
+    """Enforcer that evaluates the matcher only on the rules whose columns equal what the matcher compares
+    them to, found through a hash index. Decisions and explanations are the same as a full scan; matchers
+    without top-level equality conditions are evaluated on every rule as usual.
+    """
+
+    _policy_version = 0
+    _index = None
+    _index_key = None
+
+    def index_columns(self):
+        """The policy columns the index is keyed on, None when enforce scans every rule"""
+        index = self._current_index()
+        if index is None:
+            return None
+        p_tokens = self.model["p"]["p"].tokens
+        return [p_tokens[column] for column, _, _ in index.conditions]
+
+    def enforce_ex(self, *rvals):
+        if not self.enabled or (rvals and isinstance(rvals[0], EnforceContext)):
+            return super().enforce_ex(*rvals)
+        index = self._current_index()
+        if index is None or len(rvals) != len(self.model["r"]["r"].tokens):
+            return super().enforce_ex(*rvals)
+
+        key = []
+        for _, r_column, constant in index.conditions:
+            value = constant if r_column is None else rvals[r_column]
+            if not isinstance(value, str):
+                # Only strings are known to compare equal exactly when they hash equal
+                return super().enforce_ex(*rvals)
+            key.append(value)
+
+        candidates = index.rows.get(tuple(key))
+        if not candidates:
+            # Every rule fails the matcher. casbin treats an empty policy differently, so answer directly
+            return effect_to_bool(self.eft.final_effect({Effector.INDETERMINATE})), []
+
+        assertion = self.model["p"]["p"]
+        assertion.policy = candidates
+        try:
+            return super().enforce_ex(*rvals)
+        finally:
+            assertion.policy = index.policy
+
+    def _current_index(self):
+        """The index for the current policy and matcher, rebuilt after any change"""
+        if "p" not in self.model.keys() or "p" not in self.model["p"] or "m" not in self.model.keys():
+            return None
+        assertion = self.model["p"]["p"]
+        policy = assertion.policy
+        matcher = self.model["m"]["m"].value
+        key = (len(policy), self._policy_version, matcher)
+        if self._index_key == key and self._index is not None and self._index.policy is policy:
+            return self._index if self._index.conditions else None
+
+        conditions = equality_conditions(matcher, self.model["r"]["r"].tokens, assertion.tokens)
+        width = len(assertion.tokens)
+        if not policy or not conditions or any(len(rule) != width for rule in policy):
+            # casbin reports malformed rules and handles empty policies itself
+            conditions = []
+        self._index = _PolicyIndex(policy, conditions)
+        self._index_key = key
+        return self._index if conditions else None
+
+    # Every policy change goes through these, so counting them tells when the index is stale
+    def _add_policy(self, *args):
+        self._policy_version += 1
+        return super()._add_policy(*args)
+
+    def _add_policies(self, *args):
+        self._policy_version += 1
+        return super()._add_policies(*args)
+
+    def _update_policy(self, *args):
+        self._policy_version += 1
+        return super()._update_policy(*args)
+
+    def _update_policies(self, *args):
+        self._policy_version += 1
+        return super()._update_policies(*args)
+
+    def _update_filtered_policies(self, *args):
+        self._policy_version += 1
+        return super()._update_filtered_policies(*args)
+
+    def _remove_policy(self, *args):
+        self._policy_version += 1
+        return super()._remove_policy(*args)
+
+    def _remove_policies(self, *args):
+        self._policy_version += 1
+        return super()._remove_policies(*args)
+
+    def _remove_filtered_policy(self, *args):
+        self._policy_version += 1
+        return super()._remove_filtered_policy(*args)
+
+    def _remove_filtered_policy_returns_effects(self, *args):
+        self._policy_version += 1
+        return super()._remove_filtered_policy_returns_effects(*args)
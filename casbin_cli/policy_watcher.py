@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+from collections import Counter
+from .policy_diff import apply_rule_changes, parse_rule
+
+DEFAULT_WATCH_INTERVAL = 1.0
+
+class PolicyWatcher:
+    def __init__(self, session, path, interval=DEFAULT_WATCH_INTERVAL):
+        """Poll a policy file and apply each edit to the session's enforcer as rule additions and removals.
+
+        Only lines that changed since the last poll are parsed, and a rule is added or removed only when
+        the first copy of it appears or the last one disappears. The file is read and diffed outside the
+        session lock, so serving is held up only while the changed rules are applied.
+        """
+        if interval <= 0:
+            raise ValueError("Watch interval must be positive")
+        self.session = session
+        self.path = path
+        self.interval = interval
+        self.reloads = 0
+
+        self._signature = PolicyWatcher._stat(path)
+        self._lines = PolicyWatcher._read_lines(path)
+        self._rules = Counter()
+        for line, count in self._lines.items():
+            rule = parse_rule(line)
+            if rule is not None:
+                self._rules[rule] += count
+
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Apply the changes made since the last poll, (added, removed) rule counts or None if unchanged.
+
+        Rules of policy types the model does not define are skipped, as loading the file skips them. The
+        file is only considered seen once its changes are applied, so a failed poll is retried.
+        """
+        signature = PolicyWatcher._stat(self.path)
+        if signature is None or signature == self._signature:
+            return None
+
+        lines = PolicyWatcher._read_lines(self.path)
+        added_lines = lines - self._lines
+        removed_lines = self._lines - lines
+        if not added_lines and not removed_lines:
+            self._signature = signature
+            return None
+
+        rules = self._rules.copy()
+        added = []
+        removed = []
+        for line, count in removed_lines.items():
+            rule = parse_rule(line)
+            if rule is not None:
+                rules[rule] -= count
+                if rules[rule] <= 0:
+                    del rules[rule]
+                    removed.append(rule)
+        for line, count in added_lines.items():
+            rule = parse_rule(line)
+            if rule is not None:
+                if rule not in rules:
+                    added.append(rule)
+                rules[rule] += count
+
+        # A rule moved to another line, or reformatted, is neither added nor removed
+        moved = set(added) & set(removed)
+        model = self.session.enforcer.get_model().model
+        ptypes = set(model.get('p', {})) | set(model.get('g', {}))
+        added = [rule for rule in added if rule not in moved and rule[0] in ptypes]
+        removed = [rule for rule in removed if rule not in moved and rule[0] in ptypes]
+
+        counts = 0, 0
+        if added or removed:
+            session = self.session
+            with session.lock:
+                try:
+                    counts = apply_rule_changes(session.enforcer, added, removed)
+                finally:
+                    # Even a partly applied change makes cached decisions stale
+                    if session.decision_cache is not None:
+                        session.decision_cache.clear()
+                    if session.role_index is not None:
+                        session.role_index.sync()
+            self.reloads += 1
+        self._signature = signature
+        self._lines = lines
+        self._rules = rules
+        return counts
+
+    def start(self):
+        """Poll in a daemon thread until stop() is called"""
+        self._thread = threading.Thread(target=self._run, name='policy-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # A half-written or briefly missing file is picked up again on the next poll
+                print(f"Policy watcher: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _stat(path):
+        """What tells a changed file apart: mtime, size and inode (editors and atomic saves replace it)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @staticmethod
+    def _read_lines(path):
+        with open(path, encoding='utf-8') as f:
+            return Counter(line.strip() for line in f)
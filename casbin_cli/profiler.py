@@ -0,0 +1,44 @@
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+class Profiler:
+    def __init__(self, path, memory=False, top=20):
+        """Profile a call with cProfile, and optionally tracemalloc for peak memory"""
+        self.path = path
+        self.memory = memory
+        self.top = top
+
+    @property
+    def summary_path(self):
+        """The text summary is written next to the .prof file"""
+        return self.path + '.txt'
+
+    def run(self, func, *args, **kwargs):
+        """Call func under the profiler and write the .prof file and text summary afterwards"""
+        profile = cProfile.Profile()
+        if self.memory:
+            tracemalloc.start()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            peak = None
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            self._write(profile, peak)
+
+    def _write(self, profile, peak):
+        profile.dump_stats(self.path)
+
+        summary = io.StringIO()
+        if peak is not None:
+            summary.write(f"Peak traced memory: {peak / 1024.0 / 1024.0:.3f} MiB\n\n")
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats('cumulative').print_stats(self.top)
+
+        with open(self.summary_path, 'w') as f:
+            f.write(summary.getvalue())
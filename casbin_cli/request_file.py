@@ -0,0 +1,91 @@
+import csv
+import json
+from .commands import request_value
+from .serializer import Serializer
+
+DEFAULT_CHUNK_SIZE = 1000
+
+class InterruptedOutput(Exception):
+    """A request failed after the decisions before it were written"""
+
+def batch_enforce_file(enforcer, path, output_stream, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, ndjson=False):
+    """Enforce every request of a CSV or NDJSON file chunk by chunk, writing the decisions as they are made.
+
+    The output is the batchEnforce response, or one decision per line with ndjson. Only one chunk per worker
+    is held in memory at a time, whatever the size of the file. Every row of a chunk is checked before any of
+    its decisions are written; a failure after output has started ends the line written so far and raises
+    InterruptedOutput. Returns the number of requests.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    size = len(enforcer.get_model()["r"]["r"].tokens)
+    chunks = _chunks(read_requests(path, size), chunk_size)
+    if workers > 1:
+        from .parallel import ParallelBatchEnforcer
+        results = ParallelBatchEnforcer(enforcer, workers, chunk_size).enforce_chunks(chunks)
+    else:
+        results = map(enforcer.batch_enforce, chunks)
+
+    write = Serializer.writer(output_stream)
+    separator = b'\n' if ndjson else b','
+    count = 0
+    try:
+        for decisions in results:
+            encoded = separator.join(b'true' if decision else b'false' for decision in decisions)
+            if ndjson:
+                write(encoded + b'\n')
+            else:
+                write(b',' + encoded if count else b'{"allow":null,"explain":[' + encoded)
+            count += len(decisions)
+    except Exception as e:
+        if not count:
+            raise
+        if not ndjson:
+            write(b'\n')
+        output_stream.flush()
+        raise InterruptedOutput(f"{e} (after {count} decisions were written)") from e
+
+    if not ndjson:
+        write(b']}\n' if count else b'{"allow":null,"explain":[]}\n')
+    output_stream.flush()
+    return count
+
+def read_requests(path, size=None):
+    """Requests of a CSV file, one per row, or of an NDJSON file holding one JSON array per line.
+
+    CSV values may be quoted to hold commas; like command line arguments, a value that is a JSON object
+    becomes an ABAC attribute object. Blank lines and lines starting with # are skipped. With size, every
+    request must have that many values.
+    """
+    ndjson = path.endswith(('.ndjson', '.jsonl'))
+    with open(path, encoding='utf-8', newline='') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip() or (not ndjson and line.lstrip().startswith('#')):
+                continue
+            request = _ndjson_request(path, line_number, line) if ndjson else _csv_request(line)
+            if size is not None and len(request) != size:
+                raise ValueError(f"{path}:{line_number}: expected {size} request values, got {len(request)}")
+            yield request
+
+def _csv_request(line):
+    row = next(csv.reader([line], skipinitialspace=True))
+    return [request_value(value.strip()) for value in row]
+
+def _ndjson_request(path, line_number, line):
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from None
+    if not isinstance(request, list) or not all(isinstance(value, (str, dict)) for value in request):
+        raise ValueError(f"{path}:{line_number}: expected a JSON array of strings and objects")
+    return request
+
+def _chunks(requests, chunk_size):
+    chunk = []
+    for request in requests:
+        chunk.append(request)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
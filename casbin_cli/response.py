@@ -1,12 +1,16 @@
 class ResponseBody:  
-    def __init__(self, allow=None, explain=None):  
+    def __init__(self, allow=None, explain=None, error=None):  
         """The response body class is used to unify the JSON output format"""  
         self.allow = allow  
         self.explain = explain  
+        self.error = error  
       
     def to_dict(self):  
         """Convert to dictionary format"""  
-        return {  
+        result = {  
             "allow": self.allow,  
             "explain": self.explain  
-        }
\ No newline at end of file
+        }  
+        if self.error is not None:  
+            result["error"] = self.error  
+        return result
\ No newline at end of file
@@ -0,0 +1,217 @@
+from collections import Counter, deque
+from itertools import compress, count
+from operator import is_not
+
+def _walk(start, neighbours):
+    """Breadth-first closure in the order casbin's get_implicit_roles_for_user reports it"""
+    found = {}
+    queue = deque([start])
+    while queue:
+        for name in neighbours(queue.popleft()):
+            if name not in found:
+                found[name] = None
+                queue.append(name)
+    return found
+
+def _common_length(first, second, limit):
+    """How many leading items, at most limit, two iterables share by identity, counted without a Python loop"""
+    return min(next(compress(count(), map(is_not, first, second)), limit), limit)
+
+class RoleClosureIndex:
+    # Commands answered from the index: CLI name -> index method
+    COMMANDS = {
+        'getImplicitRolesForUser': 'implicit_roles',
+        'getImplicitPermissionsForUser': 'implicit_permissions',
+        'getImplicitUsersForRole': 'implicit_users',
+    }
+
+    def __init__(self, enforcer):
+        """Transitive closure of the role graph: every role a user inherits and every user a role reaches.
+
+        Only plain user-role grouping rules without domains or matching functions are indexed; for other
+        models every query falls back to walking the graph like casbin does.
+        """
+        self.enforcer = enforcer
+        self.rebuild()
+
+    def rebuild(self):
+        """Materialize the closure of every node from the current grouping rules"""
+        rules = self._grouping_rules()
+        self.enabled = rules is not None
+        self._counts = Counter(rules or ())
+        self._policies = self._snapshot(self._grouping_policies()) if self.enabled else {}
+        self._roles = {}
+        self._users = {}
+        for rule in self._counts:
+            self._link(rule)
+
+        self._role_closure = {user: _walk(user, self._direct_roles) for user in self._roles}
+        self._user_closure = {role: _walk(role, self._direct_users) for role in self._users}
+
+    def sync(self):
+        """Bring the index up to date after the policy changed.
+
+        Each grouping policy is compared with a shallow copy taken at the last sync. casbin appends, removes
+        or replaces rule objects in one stretch of the list, so only that stretch is diffed, and a command
+        that leaves the grouping rules alone costs one list comparison. Only the nodes that reach a changed
+        rule are recomputed.
+        """
+        if not self.enabled or not self._indexable():
+            self.rebuild()
+            return
+
+        added = []
+        removed = []
+        policies = self._grouping_policies()
+        for ptype, policy in policies.items():
+            previous = self._policies.get(ptype, [])
+            # List comparison checks identity before equality, in C
+            if len(policy) == len(previous) and policy == previous:
+                continue
+            if len(policy) > len(previous) and policy[:len(previous)] == previous:
+                added.extend((ptype, rule) for rule in policy[len(previous):])
+                continue
+            limit = min(len(policy), len(previous))
+            start = _common_length(policy, previous, limit)
+            end = _common_length(reversed(policy), reversed(previous), limit - start)
+            current = policy[start:len(policy) - end]
+            previous = previous[start:len(previous) - end]
+            previous_ids = set(map(id, previous))
+            current_ids = set(map(id, current))
+            added.extend((ptype, rule) for rule in current if id(rule) not in previous_ids)
+            removed.extend((ptype, rule) for rule in previous if id(rule) not in current_ids)
+        for ptype in self._policies.keys() - policies.keys():
+            removed.extend((ptype, rule) for rule in self._policies[ptype])
+        if not added and not removed:
+            return
+        if any(len(rule) != 2 for _, rule in added):
+            self.rebuild()
+            return
+        self._policies = self._snapshot(policies)
+
+        # The same rule may be listed more than once; only the first copy links and the last one unlinks
+        linked = []
+        unlinked = []
+        for ptype, (user, role) in removed:
+            rule = (ptype, user, role)
+            self._counts[rule] -= 1
+            if self._counts[rule] == 0:
+                del self._counts[rule]
+                unlinked.append(rule)
+        for ptype, (user, role) in added:
+            rule = (ptype, user, role)
+            self._counts[rule] += 1
+            if self._counts[rule] == 1:
+                linked.append(rule)
+        changed = set(linked) ^ set(unlinked)
+        if not changed:
+            return
+
+        # A node's closure can only change if it reaches the source (or target) of a changed rule
+        stale_users = set()
+        stale_roles = set()
+        for _, user, role in changed:
+            stale_users.add(user)
+            stale_users.update(self._user_closure.get(user, ()))
+            stale_roles.add(role)
+            stale_roles.update(self._role_closure.get(role, ()))
+
+        for rule in unlinked:
+            if rule in changed:
+                self._unlink(rule)
+        for rule in linked:
+            if rule in changed:
+                self._link(rule)
+
+        for user in stale_users:
+            self._role_closure.pop(user, None)
+            if user in self._roles:
+                self._role_closure[user] = _walk(user, self._direct_roles)
+        for role in stale_roles:
+            self._user_closure.pop(role, None)
+            if role in self._users:
+                self._user_closure[role] = _walk(role, self._direct_users)
+
+    def implicit_roles(self, user, domain=""):
+        """Every role user has directly or through inheritance"""
+        if domain or not self.enabled:
+            return self.enforcer.get_implicit_roles_for_user(user, domain)
+        return list(self._role_closure.get(user, ()))
+
+    def implicit_users(self, role):
+        """Every user or role that has role directly or through inheritance"""
+        if not self.enabled:
+            return RoleClosureIndex.walk_users(self.enforcer, role)
+        return list(self._user_closure.get(role, ()))
+
+    def implicit_permissions(self, user, domain=""):
+        """The policy rules of user and every role it inherits, grouped by subject like casbin returns them"""
+        if domain or not self.enabled:
+            return self.enforcer.get_implicit_permissions_for_user(user, domain)
+
+        # One pass over the policy instead of one filtered scan per role. In a role cycle user is one of its
+        # own roles and casbin lists its rules twice, which is kept for identical output
+        subjects = [user] + list(self._role_closure.get(user, ()))
+        groups = {subject: [] for subject in subjects}
+        for rule in self.enforcer.get_policy():
+            group = groups.get(rule[0])
+            if group is not None:
+                group.append(rule)
+        return [rule for subject in subjects for rule in groups[subject]]
+
+    @staticmethod
+    def walk_users(enforcer, role):
+        """Walk the role graph upwards without an index, the counterpart of get_implicit_roles_for_user"""
+        managers = list(enforcer.rm_map.values())
+        return list(_walk(role, lambda name: [user for rm in managers for user in rm.get_users(name)]))
+
+    def _grouping_rules(self):
+        """(ptype, user, role) for every grouping rule, None when the model cannot be indexed"""
+        if not self._indexable():
+            return None
+        rules = []
+        for ptype, policy in self._grouping_policies().items():
+            for rule in policy:
+                if len(rule) != 2:
+                    return None
+                rules.append((ptype, rule[0], rule[1]))
+        return rules
+
+    def _indexable(self):
+        """Whether every role manager links plain names, without domains or matching functions"""
+        return not any(getattr(rm, 'matching_func', None) is not None or
+                       getattr(rm, 'domain_matching_func', None) is not None for rm in self.enforcer.rm_map.values())
+
+    def _grouping_policies(self):
+        """The rule list of every grouping type that has a role manager"""
+        grouping = self.enforcer.get_model().model.get("g", {})
+        return {ptype: grouping[ptype].policy for ptype in self.enforcer.rm_map if ptype in grouping}
+
+    @staticmethod
+    def _snapshot(policies):
+        # Shallow copies keep the old rule objects alive, so their ids cannot be reused by new rules
+        return {ptype: list(policy) for ptype, policy in policies.items()}
+
+    def _direct_roles(self, user):
+        return self._roles.get(user, ())
+
+    def _direct_users(self, role):
+        return self._users.get(role, ())
+
+    def _link(self, rule):
+        # The same link may come from several grouping types, count them so removing one keeps the link
+        _, user, role = rule
+        roles = self._roles.setdefault(user, {})
+        roles[role] = roles.get(role, 0) + 1
+        users = self._users.setdefault(role, {})
+        users[user] = users.get(user, 0) + 1
+
+    def _unlink(self, rule):
+        _, user, role = rule
+        for index, key, value in ((self._roles, user, role), (self._users, role, user)):
+            links = index[key]
+            links[value] -= 1
+            if links[value] == 0:
+                del links[value]
+            if not links:
+                del index[key]
@@ -0,0 +1,94 @@
+import json
+import os
+from .utils import timed_import
+
+# Tried in this order when no backend is requested
+BACKENDS = ('orjson', 'ujson', 'json')
+
+# Importing a fast encoder costs milliseconds, below this many rows the standard library is quicker end to end
+FAST_ENCODER_MIN_ROWS = 1000
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+class Serializer:
+    def __init__(self, backend=None):
+        """Compact UTF-8 JSON encoder using orjson or ujson when installed and the standard library otherwise.
+
+        backend forces one of BACKENDS; the CASBIN_CLI_JSON environment variable does the same for the CLI.
+        """
+        backend = backend or os.environ.get('CASBIN_CLI_JSON') or None
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+
+        for name in (backend,) if backend else BACKENDS:
+            encode = Serializer._load(name)
+            if encode is not None:
+                self.name = name
+                self._encode = encode
+                return
+        raise ValueError(f"JSON backend '{backend}' is not installed")
+
+    @staticmethod
+    def available():
+        """Names of the backends that can be imported here"""
+        return [name for name in BACKENDS if Serializer._load(name) is not None]
+
+    def dumps_bytes(self, obj):
+        """Encode obj, falling back to the standard library for values the fast encoders reject"""
+        try:
+            return self._encode(obj)
+        except (TypeError, OverflowError, ValueError):
+            # e.g. integers wider than 64 bits or non-string dictionary keys
+            return _stdlib_dumps(obj)
+
+    def dumps(self, obj):
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    @staticmethod
+    def writer(stream):
+        """Return write(data) appending encoded bytes to stream, through its binary buffer when it has one"""
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is None:
+            return lambda data: stream.write(data.decode('utf-8'))
+
+        # Text written earlier must reach the buffer before our bytes do
+        stream.flush()
+        return buffer.write
+
+    @staticmethod
+    def line_writer(stream):
+        """Return write(data) appending encoded lines to stream"""
+        write = Serializer.writer(stream)
+        return lambda data: write(data + b'\n')
+
+    @staticmethod
+    def _load(name):
+        if name == 'json':
+            return _stdlib_dumps
+        try:
+            module = timed_import(name)
+        except ImportError:
+            return None
+        if name == 'orjson':
+            return module.dumps
+        return lambda obj: module.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+
+_default = None
+_stdlib = None
+
+def get_serializer(rows=None):
+    """The process-wide serializer, chosen on first use.
+
+    rows is the size of the payload about to be encoded; small payloads are encoded with the standard
+    library until a fast encoder has been loaded, so one-shot commands do not pay for its import.
+    """
+    global _default, _stdlib
+    if _default is None and rows is not None and rows < FAST_ENCODER_MIN_ROWS \
+            and not os.environ.get('CASBIN_CLI_JSON'):
+        if _stdlib is None:
+            _stdlib = Serializer('json')
+        return _stdlib
+    if _default is None:
+        _default = Serializer()
+    return _default
@@ -0,0 +1,67 @@
+import os
+import socket
+import socketserver
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        """Answer newline-delimited JSON requests until the client disconnects"""
+        for raw_line in self.rfile:
+            line = raw_line.decode('utf-8').strip()
+            if not line:
+                continue
+            response = self.server.session.handle_line(line)
+            self.wfile.write(response.encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+if hasattr(socket, 'AF_UNIX'):
+    class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+else:
+    _ThreadingUnixServer = None
+
+class CommandServer:
+    def __init__(self, session, socket_path=None, host='127.0.0.1', port=None):
+        """Serve commands against a session's warm enforcer over a Unix socket or TCP"""
+        if socket_path is None and port is None:
+            raise ValueError("serve requires --socket <path> or --port <port>")
+        if socket_path is not None and _ThreadingUnixServer is None:
+            raise ValueError("Unix domain sockets are not supported on this platform")
+
+        self.session = session
+        self.socket_path = socket_path
+
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = _ThreadingUnixServer(socket_path, _RequestHandler)
+        else:
+            self.server = _ThreadingTCPServer((host, port), _RequestHandler)
+        self.server.session = self.session
+
+    @property
+    def address(self):
+        """The bound socket path or (host, port) pair"""
+        return self.server.server_address
+
+    def serve_forever(self):
+        """Handle requests until shutdown() is called or the process is interrupted"""
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """Stop a serve_forever() loop running in another thread"""
+        self.server.shutdown()
+
+    def close(self):
+        """Release the listening socket"""
+        self.server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
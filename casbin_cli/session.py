@@ -0,0 +1,125 @@
+import json
+import threading
+from .command_executor import CommandExecutor
+from .response import ResponseBody
+from .serializer import get_serializer
+from .utils import Timings, timed_import
+
+class Session:
+    def __init__(self, enforcer, decision_cache=None, timings=False, role_index=False):
+        """Keep one loaded enforcer and dispatch many commands against it.
+
+        With role_index the transitive role closure is materialized once and kept up to date.
+        """
+        self.enforcer = enforcer
+        self.decision_cache = decision_cache
+        self.timings = timings
+        self.role_index = timed_import('casbin_cli.role_index').RoleClosureIndex(enforcer) if role_index else None
+        # Long-running modes load the fast JSON encoder up front
+        get_serializer()
+        self.lock = threading.Lock()
+
+    def execute(self, command_name, args):
+        """Execute a single command and return the JSON response"""
+        with self.lock:
+            if command_name == 'decisionCacheStats':
+                return self._decision_cache_stats()
+            executor = CommandExecutor(self.enforcer, command_name, args, decision_cache=self.decision_cache,
+                                       timings=Timings() if self.timings else None, role_index=self.role_index)
+            return executor.execute()
+
+    def handle_line(self, line):
+        """Handle one JSON request line and return one JSON response line"""
+        try:
+            command_name, args = Session.parse_request(line)
+            return self.execute(command_name, args)
+        except Exception as e:
+            return Session.error_response(e)
+
+    def run_stream(self, input_stream, output_stream):
+        """Answer one JSON request per input line with one JSON response per output line"""
+        for line in input_stream:
+            line = line.strip()
+            if not line:
+                continue
+            output_stream.write(self.handle_line(line) + '\n')
+            output_stream.flush()
+
+    def run_script(self, input_stream):
+        """Apply every request line in memory and save the policy once.
+
+        The first failing line rolls the enforcer back to the last saved policy.
+        """
+        with self.lock:
+            auto_save = self.enforcer.auto_save
+            self.enforcer.enable_auto_save(False)
+            results = []
+            line_number = 0
+            try:
+                for line_number, line in enumerate(input_stream, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    command_name, args = Session.parse_request(line)
+                    executor = CommandExecutor(self.enforcer, command_name, args, decision_cache=self.decision_cache,
+                                               save_policy=False, role_index=self.role_index)
+                    results.append(executor.execute_response().allow)
+            except Exception as e:
+                self.enforcer.load_policy()
+                if self.decision_cache is not None:
+                    self.decision_cache.clear()
+                if self.role_index is not None:
+                    self.role_index.sync()
+                raise RuntimeError(f"Line {line_number}: {e}; no changes were saved") from None
+            finally:
+                self.enforcer.enable_auto_save(auto_save)
+
+            self.enforcer.save_policy()
+
+        response = ResponseBody(allow=True, explain=results)
+        return get_serializer().dumps(response.to_dict())
+
+    @staticmethod
+    def parse_request(line):
+        """Decode a request of the form {"cmd": "enforce", "args": ["alice", "data1", "read"]}"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON request: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get('cmd'), str):
+            raise ValueError("Request must be a JSON object with a string 'cmd' field")
+
+        return request['cmd'], Session.parse_args(request.get('args'))
+
+    @staticmethod
+    def parse_args(args):
+        """Validate a JSON argument array and turn it into command line strings"""
+        args = args or []
+        if not isinstance(args, list):
+            raise ValueError("Request 'args' must be a JSON array")
+        return [Session._stringify_argument(arg) for arg in args]
+
+    def _decision_cache_stats(self):
+        """Report decision cache counters, explain is null when no cache is configured"""
+        stats = self.decision_cache.stats() if self.decision_cache is not None else None
+        return get_serializer().dumps(ResponseBody(explain=stats).to_dict())
+
+    @staticmethod
+    def error_response(error):
+        """Build the JSON response returned for a failed request"""
+        response = ResponseBody(error=str(error) or type(error).__name__)
+        return get_serializer().dumps(response.to_dict())
+
+    @staticmethod
+    def _stringify_argument(arg):
+        """Turn a JSON argument into the string form the command line would pass"""
+        if arg is None or isinstance(arg, str):
+            return arg
+        if isinstance(arg, bool):
+            return 'true' if arg else 'false'
+        if isinstance(arg, list):
+            return ','.join(Session._stringify_argument(item) for item in arg)
+        if isinstance(arg, dict):
+            return json.dumps(arg)
+        return str(arg)
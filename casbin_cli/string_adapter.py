@@ -0,0 +1,36 @@
+from casbin.persist.adapter import Adapter
+from .append_file_adapter import load_policy_lines
+
+class StringAdapter(Adapter):
+    def __init__(self, text):
+        """Load policy rules from inline text without touching the filesystem"""
+        self.text = text
+
+    def load_policy(self, model):
+        """Load every non-empty line of the text as a policy rule"""
+        load_policy_lines(self.text.split('\n'), model)
+
+    def save_policy(self, model):
+        """Keep the saved policy in memory so that a later reload sees it"""
+        lines = []
+        for sec in ['p', 'g']:
+            if sec not in model.model.keys():
+                continue
+            for ptype, assertion in model.model[sec].items():
+                for rule in assertion.policy:
+                    lines.append(ptype + ", " + ", ".join(rule))
+        self.text = '\n'.join(lines)
+        return True
+
+    # Batch operations must exist for casbin to accept batch changes; save_policy keeps them
+    def add_policies(self, sec, ptype, rules):
+        return True
+
+    def remove_policies(self, sec, ptype, rules):
+        return True
+
+    def update_policy(self, sec, ptype, old_rule, new_rule):
+        return True
+
+    def update_policies(self, sec, ptype, old_rules, new_rules):
+        return True
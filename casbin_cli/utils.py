@@ -1,5 +1,63 @@
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+# (module name, seconds) for every module imported through timed_import
+_import_times = []
+
+# First bytes of a compiled policy snapshot, checked here so that loading a CSV policy never imports compiled_policy
+COMPILED_POLICY_MAGIC = b'CASBINP\x01'
+
+def is_compiled_policy(path):
+    """Whether path holds a compiled policy snapshot rather than CSV"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(COMPILED_POLICY_MAGIC)) == COMPILED_POLICY_MAGIC
+    except OSError:
+        return False
+
 def process_line_breaks(text):  
     """Handle line breaks in strings"""  
     if text is None:  
         return None  
-    return text.replace('\\n', '\n')
\ No newline at end of file
+    return text.replace('\\n', '\n')
+
+def timed_import(module_name):
+    """Import a module on first use and record how long the import took"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_times.append((module_name, time.perf_counter() - start))
+    return module
+
+def format_startup_report(start_time):
+    """Format the recorded import times in the style of python -X importtime"""
+    lines = ["startup time: cumulative [us] | phase"]
+    for module_name, seconds in _import_times:
+        lines.append(f"startup time: {int(seconds * 1e6):>15} | import {module_name}")
+    total = time.perf_counter() - start_time
+    lines.append(f"startup time: {int(total * 1e6):>15} | total since casbin_cli.client was imported")
+    return "\n".join(lines)
+
+class Timings:
+    def __init__(self):
+        """High-resolution durations of the phases of one command"""
+        self.start = time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def measure(self, phase):
+        """Add the time spent in the with-block to phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def to_dict(self):
+        """Phase durations and the total since creation, in milliseconds"""
+        result = {phase: round(seconds * 1000, 4) for phase, seconds in self.phases.items()}
+        result["total"] = round((time.perf_counter() - self.start) * 1000, 4)
+        return result
\ No newline at end of file
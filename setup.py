@@ -33,6 +33,9 @@ setup(
     install_requires=[  
         "casbin>=1.17.0",  
     ],  
+    extras_require={
+        'fast': ['orjson'],
+    },
     entry_points={  
         'console_scripts': [  
             'casbin-cli=casbin_cli.client:main',  
@@ -0,0 +1,100 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.append_file_adapter import AppendFileAdapter
+from casbin_cli.client import Client
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+def _run(command, model_file, policy_file, *args):
+    return json.loads(Client.run([command, "-m", model_file, "-p", policy_file] + list(args)))
+
+class TestAppendFileAdapter:
+    """Test cases for incremental policy persistence"""
+
+    def test_add_policy_appends(self, temp_model_file, temp_policy_file):
+        """Test that addPolicy appends a line instead of rewriting the file"""
+        original = _read(temp_policy_file)
+
+        with patch.object(AppendFileAdapter, 'save_policy') as save_policy:
+            assert _run("addPolicy", temp_model_file, temp_policy_file, "eve", "data3", "read")["allow"] is True
+            assert _run("addRoleForUser", temp_model_file, temp_policy_file, "eve", "data2_admin")["allow"] is True
+            save_policy.assert_not_called()
+
+        # The fixture file has no trailing newline, so one is added before the first appended line
+        assert _read(temp_policy_file) == original + "\np, eve, data3, read\ng, eve, data2_admin\n"
+        assert _run("enforce", temp_model_file, temp_policy_file, "eve", "data2", "write")["allow"] is True
+
+    def test_remove_policy_keeps_other_lines(self, temp_model_file, temp_policy_file):
+        """Test that removing a rule leaves comments and the other lines untouched"""
+        with open(temp_policy_file, 'w') as f:
+            f.write("# owners\np, alice, data1, read\np, bob, data2, write\n\ng, alice, data2_admin\n")
+
+        with patch.object(AppendFileAdapter, 'save_policy') as save_policy:
+            assert _run("removePolicy", temp_model_file, temp_policy_file, "alice", "data1", "read")["allow"] is True
+            save_policy.assert_not_called()
+
+        assert _read(temp_policy_file) == "# owners\np, bob, data2, write\n\ng, alice, data2_admin\n"
+
+    def test_remove_filtered_policy(self, temp_model_file, temp_policy_file):
+        """Test that deleteUser drops every rule of the user"""
+        _run("deleteUser", temp_model_file, temp_policy_file, "alice")
+
+        assert [line.strip() for line in _read(temp_policy_file).splitlines()] == [
+            "p, bob, data2, write",
+            "p, data2_admin, data2, read",
+            "p, data2_admin, data2, write",
+        ]
+
+    def test_update_policy(self, temp_policy_file):
+        """Test that update_policy replaces the matching line in place"""
+        adapter = AppendFileAdapter(temp_policy_file)
+        adapter.update_policy("p", "p", ["bob", "data2", "write"], ["bob", "data3", "write"])
+
+        lines = [line.strip() for line in _read(temp_policy_file).splitlines()]
+        assert lines[1] == "p, bob, data3, write"
+        assert "p, bob, data2, write" not in lines
+        assert adapter.writes == 1
+
+    def test_full_save_fallback(self, temp_model_file, temp_policy_file):
+        """Test that a mutation the adapter did not persist falls back to save_policy"""
+        with patch.object(AppendFileAdapter, 'add_policies', return_value=True) as add_policies, \
+                patch.object(AppendFileAdapter, 'save_policy') as save_policy:
+            _run("addPolicy", temp_model_file, temp_policy_file, "eve", "data3", "read")
+            add_policies.assert_called_once()
+            save_policy.assert_called_once()
+
+    def test_no_op_mutations_leave_the_file_unchanged(self, temp_model_file, temp_policy_file, tmp_path):
+        """Test that mutations that change nothing neither append nor rewrite the file"""
+        with open(temp_policy_file, 'w') as f:
+            f.write("# owners\np, alice, data1, read\np, bob, data2, write\ng, alice, data2_admin\n")
+        original = _read(temp_policy_file)
+        same_policy = tmp_path / "same.csv"
+        same_policy.write_text(original)
+
+        assert _run("addPolicy", temp_model_file, temp_policy_file, "alice", "data1", "read")["allow"] is False
+        assert _run("removePolicy", temp_model_file, temp_policy_file, "eve", "data3", "read")["allow"] is False
+        assert _run("deleteUser", temp_model_file, temp_policy_file, "eve")["allow"] is False
+        assert _run("applyPolicy", temp_model_file, temp_policy_file, str(same_policy))["explain"]["added"] == 0
+        assert _read(temp_policy_file) == original
@@ -0,0 +1,76 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.bench import Benchmark, percentiles
+from casbin_cli.client import Client
+
+class TestBenchmark:
+    """Test cases for the bench command"""
+
+    def test_generate_policy_shape(self):
+        """Test that the generated policy has the configured size and role depth"""
+        bench = Benchmark(users=10, roles=6, objects=4, depth=3)
+        lines = bench.generate_policy()
+
+        assert sum(1 for line in lines if line.startswith("p,")) == 8
+        assert sum(1 for line in lines if line.startswith("g, user")) == 10
+        # Six roles over three levels: two top-level roles and four with a parent
+        assert sum(1 for line in lines if line.startswith("g, role")) == 4
+        assert "g, role5, role3" in lines and "g, role3, role1" in lines
+
+    def test_requests_are_reproducible(self):
+        """Test that the same seed produces the same requests"""
+        assert Benchmark(requests=20, seed=7).generate_requests() == Benchmark(requests=20, seed=7).generate_requests()
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles in milliseconds"""
+        result = percentiles([i / 1000.0 for i in range(1, 101)])
+        assert (result["p50"], result["p95"], result["p99"]) == (50.0, 95.0, 99.0)
+        assert percentiles([])["p50"] is None
+
+    def test_invalid_config(self):
+        """Test that empty workloads are rejected"""
+        with pytest.raises(ValueError):
+            Benchmark(users=0)
+
+    def test_bench_command_report(self):
+        """Test that the bench command prints a machine-readable report"""
+        result = Client.run(["bench", "--users", "20", "--roles", "5", "--objects", "5",
+                             "--requests", "50", "--cold-starts", "1"])
+        report = json.loads(result)
+
+        assert report["config"]["users"] == 20
+        assert report["enforce"]["requests"] == 50
+        assert report["enforce"]["latencyMs"]["p99"] >= report["enforce"]["latencyMs"]["p50"]
+        assert report["coldStartMs"]["p50"] > 0
+        assert report["loadMs"]["total"] >= report["loadMs"]["model"]
+        assert report["serializeMs"]["getPolicy"]["rows"] == 10
+        assert report["serializeMs"]["getPolicy"]["json"] >= 0
+        assert report["memory"] is None
+
+    def test_memory_report(self):
+        """Test that the memory comparison shows the CLI's load sharing repeated tokens"""
+        report = Benchmark(users=2000, roles=10, objects=50, requests=0, cold_starts=0, memory=True).run()
+        memory = report["memory"]
+        assert memory["cli"]["policyMiB"] < memory["casbin"]["policyMiB"]
+        assert memory["cli"]["tracedMiB"] > 0 and memory["savedPercent"] is not None
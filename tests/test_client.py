@@ -16,6 +16,8 @@ import pytest
 import json  
 import sys  
 import os  
+import pstats
+import subprocess
 from unittest.mock import patch, MagicMock  
   
 # Add the project root to the path  
@@ -206,6 +208,89 @@ g, alice, data2_admin"""
             result = Client.run(["--version"])  
             mock_print.assert_called()  
   
+    def test_startup_report(self, temp_model_file, temp_policy_file, capsys):
+        """Test that --startup-report leaves stdout untouched and reports to stderr"""
+        result = Client.run(["enforce", "--startup-report", "-m", temp_model_file, "-p", temp_policy_file, "alice", "data1", "read"])
+        assert json.loads(result)["allow"] is True
+
+        captured = capsys.readouterr()
+        assert captured.out.strip() == result
+        assert "startup time:" in captured.err
+        assert "total since casbin_cli.client was imported" in captured.err
+
+    def test_timings(self, temp_model_file, temp_policy_file):
+        """Test that --timings attaches per-phase durations next to allow/explain"""
+        result = Client.run(["addPolicy", "-m", temp_model_file, "-p", temp_policy_file, "--timings", "eve", "data3", "read"])
+        response = json.loads(result)
+
+        assert response["allow"] is True
+        assert set(response["timing"]) >= {"parse", "load", "execute", "serialize", "total"}
+        assert all(value >= 0 for value in response["timing"].values())
+        assert response["timing"]["total"] >= response["timing"]["load"]
+
+        result = Client.run(["enforce", "-m", temp_model_file, "-p", temp_policy_file, "eve", "data3", "read"])
+        assert "timing" not in json.loads(result)
+
+    def test_ndjson_pagination(self, temp_model_file, temp_policy_file, capsys):
+        """Test that --ndjson streams one row per line and --limit/--offset page the rows"""
+        result = Client.run(["getPolicy", "--ndjson", "--offset", "1", "--limit", "2", "-m", temp_model_file, "-p", temp_policy_file])
+        assert result == ""
+
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows == [["bob", "data2", "write"], ["data2_admin", "data2", "read"]]
+
+        Client.run(["enforceEx", "--ndjson", "-m", temp_model_file, "-p", temp_policy_file, "alice", "data1", "read"])
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [{"allow": True, "explain": ["alice", "data1", "read"]}]
+
+    def test_profile(self, temp_model_file, temp_policy_file, tmp_path):
+        """Test that --profile writes a cProfile dump and a text summary"""
+        profile_path = str(tmp_path / "enforce.prof")
+        result = Client.run(["enforce", "--profile", profile_path, "--profile-memory",
+                             "-m", temp_model_file, "-p", temp_policy_file, "alice", "data1", "read"])
+        assert json.loads(result)["allow"] is True
+
+        stats = pstats.Stats(profile_path)
+        assert stats.total_calls > 0
+        with open(profile_path + ".txt") as f:
+            summary = f.read()
+        assert "Peak traced memory" in summary
+        assert "cumulative" in summary
+
+    def test_profile_requires_path(self, temp_model_file, temp_policy_file):
+        """Test that --profile without a path is rejected"""
+        with pytest.raises(ValueError):
+            Client.run(["enforce", "-m", temp_model_file, "-p", temp_policy_file, "alice", "data1", "read", "--profile"])
+
+        # Outside the tests it is reported like any other error: one line and exit status 1
+        root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run([sys.executable, "-m", "casbin_cli.client", "enforce", "-m", temp_model_file,
+                                 "-p", temp_policy_file, "alice", "data1", "read", "--profile"],
+                                cwd=root, capture_output=True, text=True)
+        assert result.returncode == 1
+        assert result.stdout.strip() == "--profile requires a value"
+        assert "Traceback" not in result.stderr
+
+    def test_lazy_imports(self):
+        """Test that --version and completion do not import casbin"""
+        root = os.path.join(os.path.dirname(__file__), '..')
+        code = ("import sys; from casbin_cli.client import Client; "
+                "Client.run(['--version']); Client.run(['completion', 'bash']); "
+                "print('casbin' in sys.modules, 'casbin_cli.command_executor' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        assert output.strip().splitlines()[-1] == "False False"
+
+    def test_enforce_imports_only_what_it_uses(self, temp_model_file, temp_policy_file):
+        """Test that a one-shot enforce on a CSV policy skips the modules of other commands and modes"""
+        root = os.path.join(os.path.dirname(__file__), '..')
+        unused = ['casbin_cli.compiled_policy', 'casbin_cli.policy_diff', 'casbin_cli.policy_import',
+                  'casbin_cli.role_index', 'casbin_cli.string_adapter', 'mmap', 'tempfile']
+        code = ("import sys; from casbin_cli.client import Client; "
+                f"Client.run(['enforce', '-m', {temp_model_file!r}, '-p', {temp_policy_file!r}, 'alice', 'data1', 'read']); "
+                f"print([name for name in {unused!r} if name in sys.modules])")
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        assert output.strip().splitlines()[-1] == "[]"
+
     def test_abac_enforcement(self):  
         """Test ABAC enforcement scenarios - equivalent to Java testABAC()"""  
         model_text = """[request_definition]  
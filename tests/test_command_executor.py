@@ -14,6 +14,7 @@
   
 import pytest  
 import json  
+import io
 import sys  
 import os  
 from unittest.mock import MagicMock  
@@ -22,6 +23,7 @@ from unittest.mock import MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  
   
 from casbin_cli.command_executor import CommandExecutor  
+from casbin_cli.utils import Timings
   
 class TestCommandExecutor:  
     """Detailed test cases for CommandExecutor class"""  
@@ -151,4 +153,49 @@ class TestCommandExecutor:
           
         response = json.loads(result)  
         assert response["allow"] is None  
-        assert response["explain"] == ["data2_admin"]
\ No newline at end of file
+        assert response["explain"] == ["data2_admin"]
+
+    def test_timings(self):
+        """Test that timings are appended to the JSON response"""
+        mock_enforcer = MagicMock()
+        mock_enforcer.add_policy.return_value = True
+
+        executor = CommandExecutor(mock_enforcer, "addPolicy", ["alice", "data1", "read"], timings=Timings())
+        response = json.loads(executor.execute())
+
+        assert response["allow"] is True
+        assert set(response["timing"]) == {"execute", "save", "serialize", "total"}
+
+    def test_pagination(self):
+        """Test that limit and offset select a page of a list result"""
+        mock_enforcer = MagicMock()
+        mock_enforcer.get_policy.return_value = [["u%d" % i, "data", "read"] for i in range(5)]
+
+        response = json.loads(CommandExecutor(mock_enforcer, "getPolicy", [], limit=2, offset=1).execute())
+        assert response["explain"] == [["u1", "data", "read"], ["u2", "data", "read"]]
+
+        response = json.loads(CommandExecutor(mock_enforcer, "getPolicy", [], offset=4).execute())
+        assert response["explain"] == [["u4", "data", "read"]]
+
+        with pytest.raises(ValueError):
+            CommandExecutor(mock_enforcer, "getPolicy", [], limit=-1)
+
+    def test_execute_ndjson(self):
+        """Test that list results are written one JSON row per line"""
+        mock_enforcer = MagicMock()
+        mock_enforcer.get_policy.return_value = [["alice", "data1", "read"], ["bob", "data2", "write"]]
+        mock_enforcer.enforce.return_value = True
+
+        output = io.StringIO()
+        CommandExecutor(mock_enforcer, "getPolicy", [], limit=1).execute_ndjson(output)
+        assert output.getvalue() == '["alice","data1","read"]\n'
+
+        output = io.StringIO()
+        CommandExecutor(mock_enforcer, "enforce", ["alice", "data1", "read"]).execute_ndjson(output)
+        assert json.loads(output.getvalue()) == {"allow": True, "explain": None}
+
+        mock_enforcer.enforce_ex.return_value = (True, ["alice", "data1", "read"])
+        output = io.StringIO()
+        CommandExecutor(mock_enforcer, "enforceEx", ["alice", "data1", "read"]).execute_ndjson(output)
+        assert output.getvalue().count("\n") == 1
+        assert json.loads(output.getvalue()) == {"allow": True, "explain": ["alice", "data1", "read"]}
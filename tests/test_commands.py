@@ -0,0 +1,122 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import casbin
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.client import Client
+from casbin_cli.command_executor import CommandExecutor
+from casbin_cli.commands import COMMANDS, get_command
+
+class TestCommandRegistry:
+    """Test cases for the static command registry"""
+
+    def test_methods_exist(self):
+        """Test that every registered command targets an enforcer method"""
+        for command in COMMANDS.values():
+            if command.name in CommandExecutor.CLI_METHODS:
+                # Implemented by the CLI itself
+                continue
+            assert callable(getattr(casbin.Enforcer, command.method, None)), command.name
+
+    def test_unknown_command(self):
+        """Test that unknown commands are rejected"""
+        with pytest.raises(ValueError, match="Unknown command 'get_policy'"):
+            get_command('get_policy')
+
+    def test_request_values_are_not_guessed(self):
+        """Test that request values stay strings unless they are JSON objects"""
+        assert get_command('enforce').convert(["alice", "1", "true"]) == ["alice", "1", "true"]
+        assert get_command('enforce').convert(['{"Age": 25}', "data1"]) == [{"Age": 25}, "data1"]
+
+    def test_rules_and_filters(self):
+        """Test list, index and optional parameters"""
+        assert get_command('addPolicies').convert(["alice,data1,read", "bob,data2,write"]) == \
+            [[["alice", "data1", "read"], ["bob", "data2", "write"]]]
+        assert get_command('addNamedPolicies').convert(["p", "alice,data1,read"]) == ["p", [["alice", "data1", "read"]]]
+        assert get_command('getFilteredPolicy').convert(["0", "alice"]) == [0, "alice"]
+        assert get_command('getImplicitRolesForUser').convert(["alice"]) == ["alice"]
+        assert get_command('updatePolicy').convert(["a,b,c", "a,b,d"]) == [["a", "b", "c"], ["a", "b", "d"]]
+        assert get_command('updatePolicies').convert(["a,b,c;d,e,f", "a,b,x;d,e,y"]) == \
+            [[["a", "b", "c"], ["d", "e", "f"]], [["a", "b", "x"], ["d", "e", "y"]]]
+
+    def test_invalid_arguments(self):
+        """Test that missing arguments and bad field indexes are reported with the usage"""
+        with pytest.raises(ValueError, match=r"Usage: hasRoleForUser <user> <role>"):
+            get_command('hasRoleForUser').convert(["alice"])
+        with pytest.raises(ValueError, match="Field index must be an integer"):
+            get_command('getFilteredPolicy').convert(["sub", "alice"])
+
+    def test_empty_arguments(self):
+        """Test that empty rules and field indexes, which the client passes as None, are usage errors"""
+        for name, args in [('addPolicies', [None]), ('addPolicies', ["a,b,c", ""]), ('getFilteredPolicy', [None]),
+                           ('updatePolicy', ["a,b,c", None]), ('updatePolicies', [None, "a,b,c"]),
+                           ('importPolicies', ["policy.csv", None])]:
+            with pytest.raises(ValueError, match=f"Usage: {name} "):
+                get_command(name).convert(args)
+
+    def test_help_and_completions_list_registry(self):
+        """Test that help text and completion scripts are generated from the registry"""
+        for generate in (Client._print_help, Client._generate_bash_completion,
+                         Client._generate_zsh_completion, Client._generate_fish_completion):
+            with patch('builtins.print') as mock_print:
+                generate()
+            output = mock_print.call_args[0][0]
+            assert all(name in output for name in COMMANDS), generate.__name__
+            assert "serve" in output
+
+    def test_domain_and_update_commands(self, tmp_path):
+        """Test the RBAC with domains and batch update commands end to end"""
+        model = tmp_path / "rbac_with_domains_model.conf"
+        model.write_text("""[request_definition]
+r = sub, dom, obj, act
+
+[policy_definition]
+p = sub, dom, obj, act
+
+[role_definition]
+g = _, _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub, r.dom) && r.dom == p.dom && r.obj == p.obj && r.act == p.act
+""")
+        policy = tmp_path / "rbac_with_domains_policy.csv"
+        policy.write_text("p, admin, domain1, data1, read\np, admin, domain2, data2, read\ng, alice, admin, domain1\n")
+
+        def run(command, *args):
+            return json.loads(Client.run([command, "-m", str(model), "-p", str(policy)] + list(args)))
+
+        assert run("getRolesForUserInDomain", "alice", "domain1")["explain"] == ["admin"]
+        assert run("addRoleForUserInDomain", "bob", "admin", "domain2")["allow"] is True
+        assert run("getUsersForRoleInDomain", "admin", "domain2")["explain"] == ["bob"]
+        assert run("getPermissionsForUserInDomain", "admin", "domain2")["explain"] == [["admin", "domain2", "data2", "read"]]
+        assert run("updatePolicies", "admin,domain1,data1,read;admin,domain2,data2,read",
+                   "admin,domain1,data1,write;admin,domain2,data2,write")["allow"] is True
+        assert run("updateNamedPolicy", "p", "admin,domain1,data1,write", "admin,domain1,data3,write")["allow"] is True
+        assert run("enforce", "alice", "domain1", "data3", "write")["allow"] is True
+        assert run("getNamedImplicitPermissionsForUser", "p", "bob", "domain2")["explain"] == \
+            [["admin", "domain2", "data2", "write"]]
+        assert run("deleteRolesForUserInDomain", "bob", "admin", "domain2")["explain"] == [["bob", "admin", "domain2"]]
+        assert run("getAllRolesByDomain", "domain2")["explain"] == []
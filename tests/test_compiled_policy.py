@@ -0,0 +1,156 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gc
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.bench import RBAC_MODEL, Benchmark
+from casbin_cli.command_executor import CommandExecutor
+from casbin_cli.compiled_policy import CompiledPolicyAdapter, is_compiled, read_snapshot
+from casbin_cli.enforcer_factory import EnforcerFactory
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+KEYMATCH_MODEL = """[request_definition]
+r = sub, dom, obj, act
+
+[policy_definition]
+p = sub, dom, obj, act
+
+[role_definition]
+g = _, _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub, r.dom) && r.dom == p.dom && keyMatch(r.obj, p.obj) && regexMatch(r.act, p.act)"""
+
+KEYMATCH_POLICY = """p, admin, tenant1, /data/*, (read)|(write)
+p, reader, tenant1, /data/public/*, read
+p, ünïcode, tenant2, /données/*, read
+p, admin, tenant2, /data/*, read
+
+g, alice, admin, tenant1
+g, bob, reader, tenant1
+g, carol, ünïcode, tenant2
+g, alice, admin, tenant2
+"""
+
+def _compile(enforcer, path):
+    return json.loads(CommandExecutor(enforcer, 'compile', [path]).execute())["explain"]
+
+class TestCompiledPolicy:
+    """Test cases for compiled policy snapshots"""
+
+    def test_round_trip_keeps_rules_and_order(self, tmp_path):
+        policy = tmp_path / 'policy.csv'
+        policy.write_text(KEYMATCH_POLICY, encoding='utf-8')
+        model = tmp_path / 'model.conf'
+        model.write_text(KEYMATCH_MODEL, encoding='utf-8')
+        csv_enforcer = EnforcerFactory.create_enforcer(str(model), str(policy))
+
+        compiled = str(tmp_path / 'policy.cpol')
+        report = _compile(csv_enforcer, compiled)
+        assert report["rules"] == 8 and report["bytes"] == os.path.getsize(compiled)
+        assert is_compiled(compiled) and not is_compiled(str(policy))
+
+        enforcer = EnforcerFactory.create_enforcer(str(model), compiled)
+        assert isinstance(enforcer.adapter, CompiledPolicyAdapter)
+        assert enforcer.get_policy() == csv_enforcer.get_policy()
+        assert enforcer.get_grouping_policy() == csv_enforcer.get_grouping_policy()
+        for request in [("alice", "tenant1", "/data/x", "write"), ("bob", "tenant1", "/data/public/a", "read"),
+                        ("bob", "tenant1", "/data/x", "read"), ("carol", "tenant2", "/données/y", "read"),
+                        ("alice", "tenant2", "/data/x", "write")]:
+            assert enforcer.enforce_ex(*request) == csv_enforcer.enforce_ex(*request), request
+
+    def test_identical_decisions_on_generated_policy(self, tmp_path):
+        benchmark = Benchmark(users=100, roles=20, objects=30, depth=3, requests=500, cold_starts=0, seed=1)
+        policy = str(tmp_path / 'policy.csv')
+        with open(policy, 'w', encoding='utf-8') as f:
+            f.write("\n".join(benchmark.generate_policy()) + "\n")
+        csv_enforcer = EnforcerFactory.create_enforcer(RBAC_MODEL, policy)
+        compiled = str(tmp_path / 'policy.cpol')
+        _compile(csv_enforcer, compiled)
+        enforcer = EnforcerFactory.create_enforcer(RBAC_MODEL, compiled)
+
+        for request in benchmark.generate_requests():
+            assert enforcer.enforce(*request) == csv_enforcer.enforce(*request), request
+
+    def test_role_graph_matches_casbin(self, tmp_path):
+        """Test that a snapshot resolves the same implicit roles as the CSV load, before and after role changes"""
+        benchmark = Benchmark(users=100, roles=20, objects=30, depth=3, requests=0, cold_starts=0, seed=2)
+        policy = str(tmp_path / 'policy.csv')
+        with open(policy, 'w', encoding='utf-8') as f:
+            f.write("\n".join(benchmark.generate_policy()) + "\ng, user1, role3\n")
+        csv_enforcer = EnforcerFactory.create_enforcer(RBAC_MODEL, policy)
+        compiled = str(tmp_path / 'policy.cpol')
+        _compile(csv_enforcer, compiled)
+        enforcer = EnforcerFactory.create_enforcer(RBAC_MODEL, compiled)
+        assert gc.isenabled()
+
+        def graph(e):
+            # Roles are kept in sets, so casbin's own order varies between runs
+            names = [f"user{i}" for i in range(100)] + [f"role{i}" for i in range(20)]
+            return {name: (sorted(e.get_implicit_roles_for_user(name)), sorted(e.get_users_for_role(name)))
+                    for name in names}
+
+        assert graph(enforcer) == graph(csv_enforcer)
+        assert graph(enforcer)["user1"][0]
+        for e in (enforcer, csv_enforcer):
+            e.enable_auto_save(False)
+            e.delete_role("role3")
+            e.add_role_for_user("user7", "role19")
+            e.delete_role_for_user("user1", "role18")
+        assert graph(enforcer) == graph(csv_enforcer)
+
+    def test_rules_of_one_type_with_different_widths(self, tmp_path):
+        enforcer = EnforcerFactory.create_enforcer(os.path.join(EXAMPLES, 'rbac_model.conf'), "")
+        enforcer.get_model().model['p']['p'].policy.extend([["a", "b", "c"], ["d", "e"], ["f", "g", "h"], ["", "x", ""]])
+        compiled = str(tmp_path / 'policy.cpol')
+        _compile(enforcer, compiled)
+        assert read_snapshot(compiled) == [("p", [["a", "b", "c"]]), ("p", [["d", "e"]]),
+                                           ("p", [["f", "g", "h"], ["", "x", ""]])]
+
+    def test_changes_are_saved_as_a_new_snapshot(self, tmp_path):
+        compiled = str(tmp_path / 'policy.cpol')
+        _compile(EnforcerFactory.create_enforcer(os.path.join(EXAMPLES, 'rbac_model.conf'),
+                                                 os.path.join(EXAMPLES, 'rbac_policy.csv')), compiled)
+        model = os.path.join(EXAMPLES, 'rbac_model.conf')
+        enforcer = EnforcerFactory.create_enforcer(model, compiled)
+
+        assert json.loads(CommandExecutor(enforcer, 'addPolicies', ["eve,data3,read", "eve,data4,read"]).execute())["allow"]
+        assert json.loads(CommandExecutor(enforcer, 'removePolicy', ["bob", "data2", "write"]).execute())["allow"]
+        reloaded = EnforcerFactory.create_enforcer(model, compiled)
+        assert reloaded.get_policy() == enforcer.get_policy()
+        assert reloaded.has_policy("eve", "data4", "read") and not reloaded.has_policy("bob", "data2", "write")
+
+    def test_corrupt_snapshot(self, tmp_path):
+        compiled = str(tmp_path / 'policy.cpol')
+        _compile(EnforcerFactory.create_enforcer(os.path.join(EXAMPLES, 'rbac_model.conf'),
+                                                 os.path.join(EXAMPLES, 'rbac_policy.csv')), compiled)
+        with open(compiled, 'rb') as f:
+            data = f.read()
+        with open(compiled, 'wb') as f:
+            f.write(data[:-6])
+        with pytest.raises(ValueError, match="truncated|not a valid"):
+            read_snapshot(compiled)
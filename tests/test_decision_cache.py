@@ -0,0 +1,103 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.command_executor import CommandExecutor
+from casbin_cli.decision_cache import DecisionCache
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.session import Session
+
+class TestDecisionCache:
+    """Test cases for the LRU decision cache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used decision is evicted first"""
+        cache = DecisionCache(max_size=2)
+        cache.put("a", True)
+        cache.put("b", False)
+        assert cache.get("a") == (True, True)
+
+        cache.put("c", True)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, True)
+        assert cache.get("c") == (True, True)
+        assert cache.stats() == {"size": 2, "maxSize": 2, "hits": 3, "misses": 1}
+
+    def test_ttl_expiry(self):
+        """Test that decisions expire after the TTL"""
+        cache = DecisionCache(ttl=5)
+        with patch('casbin_cli.decision_cache.time.monotonic', return_value=100.0):
+            cache.put("a", True)
+        with patch('casbin_cli.decision_cache.time.monotonic', return_value=104.0):
+            assert cache.get("a") == (True, True)
+        with patch('casbin_cli.decision_cache.time.monotonic', return_value=105.0):
+            assert cache.get("a") == (False, None)
+        assert cache.stats()["size"] == 0
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected"""
+        with pytest.raises(ValueError):
+            DecisionCache(max_size=0)
+        with pytest.raises(ValueError):
+            DecisionCache(ttl=0)
+
+class TestCachedDispatch:
+    """Test cases for decision caching in CommandExecutor"""
+
+    def test_repeated_enforce_hits_cache(self):
+        """Test that a repeated request is answered without evaluating the matcher"""
+        mock_enforcer = MagicMock()
+        mock_enforcer.enforce.return_value = True
+        cache = DecisionCache()
+
+        for _ in range(3):
+            result = CommandExecutor(mock_enforcer, "enforce", ["alice", "data1", "read"], decision_cache=cache).execute()
+            assert json.loads(result)["allow"] is True
+
+        mock_enforcer.enforce.assert_called_once_with("alice", "data1", "read")
+        assert cache.stats()["hits"] == 2
+
+    def test_batch_enforce_only_computes_misses(self):
+        """Test that batchEnforce evaluates only the requests missing from the cache"""
+        mock_enforcer = MagicMock()
+        mock_enforcer.enforce.return_value = True
+        mock_enforcer.batch_enforce.return_value = [False]
+        cache = DecisionCache()
+
+        CommandExecutor(mock_enforcer, "enforce", ["alice", "data1", "read"], decision_cache=cache).execute()
+        result = CommandExecutor(mock_enforcer, "batchEnforce", ["alice,data1,read", "bob,data1,read"], decision_cache=cache).execute()
+
+        assert json.loads(result)["explain"] == [True, False]
+        mock_enforcer.batch_enforce.assert_called_once_with([["bob", "data1", "read"]])
+
+    def test_mutation_flushes_cache(self, temp_model_file, temp_policy_file):
+        """Test that a policy change is visible to the next enforce"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file), decision_cache=DecisionCache())
+
+        assert json.loads(session.execute("enforce", ["eve", "data3", "read"]))["allow"] is False
+        assert json.loads(session.execute("addPolicy", ["eve", "data3", "read"]))["allow"] is True
+        assert json.loads(session.execute("enforce", ["eve", "data3", "read"]))["allow"] is True
+
+        stats = json.loads(session.execute("decisionCacheStats", []))["explain"]
+        assert stats["hits"] == 0
+        assert stats["misses"] == 2
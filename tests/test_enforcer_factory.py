@@ -15,10 +15,13 @@
 import pytest  
 import sys  
 import os  
+import json
+from unittest.mock import patch
   
 # Add the project root to the path  
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  
   
+from casbin_cli.client import Client
 from casbin_cli.enforcer_factory import EnforcerFactory  
   
 class TestEnforcerFactory:  
@@ -174,4 +177,69 @@ p, bob, domain2, data2, write"""
         # Test ABAC enforcement  
         assert enforcer.enforce("alice", "domain1", "data1", "read") is True  
         assert enforcer.enforce("alice", "domain2", "data1", "read") is False  
-        assert enforcer.enforce("bob", "domain2", "data2", "write") is True
\ No newline at end of file
+        assert enforcer.enforce("bob", "domain2", "data2", "write") is True
+
+    def test_inline_content_stays_in_memory(self):
+        """Test that inline model and policy text never touch the filesystem"""
+        model_content = """[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = r.sub == p.sub && r.obj == p.obj && r.act == p.act"""
+
+        with patch('builtins.open', side_effect=AssertionError("unexpected file access")):
+            enforcer = EnforcerFactory.create_enforcer(model_content, "p, alice, data1, read")
+
+        assert enforcer.enforce("alice", "data1", "read") is True
+
+    def test_inline_policy_save(self):
+        """Test that saving an inline policy keeps the change in memory"""
+        model_content = """[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = r.sub == p.sub && r.obj == p.obj && r.act == p.act"""
+
+        enforcer = EnforcerFactory.create_enforcer(model_content, "p, alice, data1, read|p, bob, data2, write")
+        assert enforcer.enforce("bob", "data2", "write") is True
+
+        enforcer.add_policy("eve", "data3", "read")
+        enforcer.save_policy()
+        enforcer.load_policy()
+
+        assert enforcer.enforce("eve", "data3", "read") is True
+        assert enforcer.get_adapter().text.splitlines()[-1] == "p, eve, data3, read"
+
+    def test_inline_policy_batch_changes(self):
+        """Test that batch changes of an inline policy are reported as successful"""
+        model_content = """[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = r.sub == p.sub && r.obj == p.obj && r.act == p.act"""
+        policy = "p, alice, data1, read|p, bob, data2, write"
+
+        def run(command, *args):
+            return json.loads(Client.run([command, "-m", model_content, "-p", policy] + list(args)))
+
+        assert run("addPolicies", "eve,data3,read", "eve,data4,read")["allow"] is True
+        assert run("removePolicies", "alice,data1,read", "bob,data2,write")["allow"] is True
+        assert run("updatePolicy", "alice,data1,read", "alice,data1,write")["allow"] is True
@@ -0,0 +1,103 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.bench import RBAC_MODEL
+from casbin_cli.enforcer_pool import EnforcerPool
+
+def _policy(tenant, rules=1):
+    return "\n".join(f"p, {tenant}, data{i}, read" for i in range(rules))
+
+class TestEnforcerPool:
+    """Test cases for the multi-tenant enforcer pool"""
+
+    def test_hits_reuse_the_enforcer(self):
+        """Test that the same content is served by the same enforcer"""
+        pool = EnforcerPool()
+        with pool.lease(RBAC_MODEL, _policy("alice")) as first:
+            assert first.enforce("alice", "data0", "read")
+        with pool.lease(RBAC_MODEL, _policy("alice")) as second:
+            assert second is first
+        with pool.lease(RBAC_MODEL, _policy("bob")) as third:
+            assert third is not first
+            assert not third.enforce("alice", "data0", "read")
+
+        stats = pool.stats()
+        assert (stats["size"], stats["hits"], stats["misses"], stats["hitRate"]) == (2, 1, 2, 0.3333)
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used tenant is evicted first"""
+        pool = EnforcerPool(max_entries=2)
+        for tenant in ["a", "b", "a", "c", "a"]:
+            with pool.lease(RBAC_MODEL, _policy(tenant)):
+                pass
+
+        stats = pool.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+        # "b" was evicted, "a" stayed because it was used after "b"
+        assert stats["hits"] == 2
+        with pool.lease(RBAC_MODEL, _policy("b")):
+            pass
+        assert pool.stats()["misses"] == 4
+
+    def test_eviction_by_rules(self):
+        """Test that the total number of pooled rules is bounded"""
+        pool = EnforcerPool(max_rules=10)
+        for tenant in ["a", "b", "c"]:
+            with pool.lease(RBAC_MODEL, _policy(tenant, rules=4)):
+                pass
+        assert pool.stats()["rules"] == 8
+        assert pool.stats()["size"] == 2
+
+        # A single entry over the limit is still kept
+        with pool.lease(RBAC_MODEL, _policy("big", rules=20)):
+            pass
+        assert pool.stats()["size"] == 1
+
+    def test_concurrent_leases(self):
+        """Test that concurrent requests for different tenants share the pool safely"""
+        pool = EnforcerPool(max_entries=4)
+        errors = []
+
+        def worker(tenant):
+            for _ in range(20):
+                with pool.lease(RBAC_MODEL, _policy(tenant)) as enforcer:
+                    if not enforcer.enforce(tenant, "data0", "read"):
+                        errors.append(tenant)
+
+        threads = [threading.Thread(target=worker, args=(f"t{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert pool.stats()["hits"] + pool.stats()["misses"] == 80
+
+    def test_invalid_input(self):
+        """Test limits and non-text content are rejected"""
+        with pytest.raises(ValueError):
+            EnforcerPool(max_entries=0)
+        with pytest.raises(ValueError):
+            with EnforcerPool().lease({"not": "text"}, ""):
+                pass
@@ -0,0 +1,75 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import multiprocessing
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.client import Client
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.parallel import ParallelBatchEnforcer
+
+def _requests():
+    subjects = ["alice", "bob", "data2_admin", "eve"]
+    objects = ["data1", "data2", "data3"]
+    actions = ["read", "write"]
+    return [[sub, obj, act] for sub in subjects for obj in objects for act in actions] * 5
+
+class TestParallelBatchEnforcer:
+    """Test cases for process-pool batchEnforce"""
+
+    @pytest.mark.parametrize("platform, start_method", [('linux', 'fork'), ('darwin', 'spawn')])
+    def test_matches_serial_results(self, temp_model_file, temp_policy_file, platform, start_method):
+        """Test that sharded results equal serial results in input order, with forked workers only on Linux"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        requests = _requests()
+        expected = enforcer.batch_enforce(requests)
+
+        with patch('sys.platform', platform), \
+                patch('multiprocessing.get_context', wraps=multiprocessing.get_context) as get_context:
+            results = ParallelBatchEnforcer(enforcer, workers=2, chunk_size=7).batch_enforce(requests)
+
+        get_context.assert_called_once_with(start_method)
+        assert results == expected
+        assert True in results and False in results
+
+    def test_single_worker_runs_inline(self, temp_model_file, temp_policy_file):
+        """Test that one worker does not start a pool"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        with patch('multiprocessing.get_context') as get_context:
+            results = ParallelBatchEnforcer(enforcer, workers=1).batch_enforce([["alice", "data1", "read"]])
+            get_context.assert_not_called()
+        assert results == [True]
+
+    def test_invalid_workers(self, temp_model_file, temp_policy_file):
+        """Test that a worker count below one is rejected"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        with pytest.raises(ValueError):
+            ParallelBatchEnforcer(enforcer, workers=0)
+
+    def test_client_workers_option(self, temp_model_file, temp_policy_file):
+        """Test that --workers keeps the batchEnforce JSON shape"""
+        requests = ["alice,data1,read", "bob,data1,read", "alice,data2,write", "bob,data2,write"]
+        serial = Client.run(["batchEnforce", "-m", temp_model_file, "-p", temp_policy_file] + requests)
+        parallel = Client.run(["batchEnforce", "--workers", "2", "-m", temp_model_file, "-p", temp_policy_file] + requests)
+
+        assert parallel == serial
+        assert json.loads(parallel) == {"allow": None, "explain": [True, False, True, True]}
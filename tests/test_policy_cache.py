@@ -0,0 +1,119 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.client import Client
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.policy_cache import PolicyCache
+
+def _snapshots(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.pickle'))
+
+class TestPolicyCache:
+    """Test cases for the on-disk model and policy snapshot cache"""
+
+    def test_cache_hit_skips_loading(self, temp_model_file, temp_policy_file):
+        """Test that a repeat load is restored from the snapshot with identical decisions"""
+        cache_dir = tempfile.mkdtemp()
+        first = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        assert len(_snapshots(cache_dir)) == 1
+
+        with patch('casbin.persist.adapters.FileAdapter.load_policy') as load_policy:
+            second = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+            load_policy.assert_not_called()
+
+        for request in [("alice", "data1", "read"), ("alice", "data2", "write"), ("bob", "data1", "read")]:
+            assert second.enforce(*request) == first.enforce(*request)
+        assert second.get_implicit_roles_for_user("alice") == ["data2_admin"]
+
+    def test_policy_change_invalidates(self, temp_model_file, temp_policy_file):
+        """Test that modifying the policy file produces a new snapshot"""
+        cache_dir = tempfile.mkdtemp()
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        assert enforcer.enforce("eve", "data3", "read") is False
+
+        with open(temp_policy_file, 'a') as f:
+            f.write("\np, eve, data3, read")
+
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        assert enforcer.enforce("eve", "data3", "read") is True
+        assert len(_snapshots(cache_dir)) == 2
+
+    def test_cached_enforcer_saves_policy(self, temp_model_file, temp_policy_file):
+        """Test that a restored enforcer still persists mutations to the policy file"""
+        cache_dir = tempfile.mkdtemp()
+        EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+
+        args = ["-m", temp_model_file, "-p", temp_policy_file, "--cache-dir", cache_dir]
+        response = json.loads(Client.run(["addPolicy"] + args + ["eve", "data3", "read"]))
+        assert response["allow"] is True
+
+        response = json.loads(Client.run(["enforce"] + args + ["eve", "data3", "read"]))
+        assert response["allow"] is True
+
+    def test_lru_eviction(self, temp_model_file):
+        """Test that the least recently used snapshot is evicted first"""
+        cache_dir = tempfile.mkdtemp()
+        policies = ["p, alice, data1, read", "p, bob, data2, write", "p, eve, data3, read"]
+
+        for policy in policies[:2]:
+            EnforcerFactory.create_enforcer(temp_model_file, policy, cache_dir=cache_dir, cache_size=2)
+        oldest = PolicyCache.key(True, temp_model_file, False, policies[0])
+        newest = PolicyCache.key(True, temp_model_file, False, policies[1])
+
+        # Age the second entry so it becomes the least recently used one
+        os.utime(os.path.join(cache_dir, newest + '.pickle'), ns=(1, 1))
+        EnforcerFactory.create_enforcer(temp_model_file, policies[0], cache_dir=cache_dir, cache_size=2)
+        EnforcerFactory.create_enforcer(temp_model_file, policies[2], cache_dir=cache_dir, cache_size=2)
+
+        snapshots = _snapshots(cache_dir)
+        assert len(snapshots) == 2
+        assert oldest + '.pickle' in snapshots
+        assert newest + '.pickle' not in snapshots
+
+    def test_corrupt_snapshot_is_a_miss(self, temp_model_file, temp_policy_file):
+        """Test that an unreadable snapshot is discarded and rebuilt"""
+        cache_dir = tempfile.mkdtemp()
+        EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        snapshot = os.path.join(cache_dir, _snapshots(cache_dir)[0])
+        with open(snapshot, 'wb') as f:
+            f.write(b'not a pickle')
+
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        assert enforcer.enforce("alice", "data2", "read") is True
+        assert os.path.getsize(snapshot) > len(b'not a pickle')
+
+    def test_shared_cache_dir_is_refused(self, temp_model_file, temp_policy_file):
+        """Test that a directory others can write to, or another user owns, is not trusted with snapshots"""
+        cache_dir = tempfile.mkdtemp()
+        os.chmod(cache_dir, 0o777)
+        with pytest.raises(ValueError, match="not writable by others"):
+            EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file, cache_dir=cache_dir)
+        assert _snapshots(cache_dir) == []
+
+        os.chmod(cache_dir, 0o700)
+        with patch('os.getuid', return_value=os.stat(cache_dir).st_uid + 1):
+            with pytest.raises(ValueError, match="owned by the current user"):
+                PolicyCache(cache_dir)
+        PolicyCache(cache_dir)
@@ -0,0 +1,93 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.command_executor import CommandExecutor
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.policy_diff import current_rules
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples')
+MODEL = os.path.join(EXAMPLES, 'rbac_model.conf')
+
+TARGET = """p, alice, data1, read
+p, data2_admin, data2, read
+p, data2_admin, data2, write
+p, carol, data3, read
+p, carol, data3, read
+g, alice, data2_admin
+g, bob, data2_admin
+"""
+
+class TestPolicyDiff:
+    """Test cases for diffPolicy and applyPolicy"""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        policy = tmp_path / 'policy.csv'
+        shutil.copy(os.path.join(EXAMPLES, 'rbac_policy.csv'), policy)
+        target = tmp_path / 'target.csv'
+        target.write_text(TARGET, encoding='utf-8')
+        return str(policy), str(target)
+
+    def _run(self, enforcer, command, *args):
+        return json.loads(CommandExecutor(enforcer, command, list(args)).execute())
+
+    def test_diff_does_not_change_the_policy(self, files):
+        policy, target = files
+        enforcer = EnforcerFactory.create_enforcer(MODEL, policy)
+        before = current_rules(enforcer)
+
+        explain = self._run(enforcer, 'diffPolicy', target)["explain"]
+        assert explain["added"] == [["p", "carol", "data3", "read"], ["g", "bob", "data2_admin"]]
+        assert explain["removed"] == [["p", "bob", "data2", "write"]]
+        assert explain["elapsedMs"] >= 0
+        assert current_rules(enforcer) == before
+
+    def test_apply_persists_once(self, files):
+        policy, target = files
+        enforcer = EnforcerFactory.create_enforcer(MODEL, policy)
+        writes = enforcer.adapter.writes
+
+        explain = self._run(enforcer, 'applyPolicy', target)["explain"]
+        assert (explain["added"], explain["removed"]) == (2, 1)
+        assert enforcer.enforce("bob", "data2", "read")
+        assert not enforcer.has_policy("bob", "data2", "write")
+        assert enforcer.adapter.writes == writes
+
+        # The policy file now holds the target's rules
+        reloaded = EnforcerFactory.create_enforcer(MODEL, policy)
+        target_enforcer = EnforcerFactory.create_enforcer(MODEL, target)
+        assert set(current_rules(reloaded)) == set(current_rules(target_enforcer))
+
+        explain = self._run(reloaded, 'applyPolicy', target)["explain"]
+        assert (explain["added"], explain["removed"]) == (0, 0)
+
+    def test_unknown_policy_type(self, files, tmp_path):
+        policy, _ = files
+        target = tmp_path / 'bad.csv'
+        target.write_text("p, alice, data1, read\ng2, alice, admin\n", encoding='utf-8')
+        enforcer = EnforcerFactory.create_enforcer(MODEL, policy)
+        with pytest.raises(Exception, match="bad.csv:2: policy type 'g2'"):
+            self._run(enforcer, 'applyPolicy', str(target))
+        assert enforcer.has_policy("bob", "data2", "write")
@@ -0,0 +1,175 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import pickle
+import random
+import sys
+
+import casbin
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli import parallel
+from casbin_cli.client import Client
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.policy_cache import PolicyCache
+from casbin_cli.policy_diff import apply_rule_changes, append_rules
+from casbin_cli.policy_index import IndexedEnforcer, equality_conditions
+from casbin_cli.string_adapter import StringAdapter
+
+def _model(matchers, effect="some(where (p.eft == allow))", policy="sub, obj, act"):
+    return f"""[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = {policy}
+
+[role_definition]
+g = _, _
+
+[policy_effect]
+e = {effect}
+
+[matchers]
+m = {matchers}"""
+
+RBAC = _model("g(r.sub, p.sub) && r.obj == p.obj && r.act == p.act")
+DENY_OVERRIDE = _model("g(r.sub, p.sub) && r.obj == p.obj && r.act == p.act",
+                       effect="!some(where (p.eft == deny))", policy="sub, obj, act, eft")
+ALLOW_AND_DENY = _model("r.act == p.act && g(r.sub, p.sub) && r.obj == p.obj",
+                        effect="some(where (p.eft == allow)) && !some(where (p.eft == deny))", policy="sub, obj, act, eft")
+PRIORITY = _model("g(r.sub, p.sub) && r.obj == p.obj && r.act == p.act",
+                  effect="priority(p.eft) || deny", policy="priority, sub, obj, act, eft")
+KEY_MATCH = _model("g(r.sub, p.sub) && keyMatch(r.obj, p.obj) && r.act == p.act && p.sub != \"banned\"")
+CONSTANT = _model("r.sub == p.sub && p.act == \"read\" && (r.obj == p.obj || r.obj == \"public\")")
+DISJUNCTION = _model("r.sub == p.sub || r.obj == p.obj")
+
+def _random_policy(rng, model_name, rules=150):
+    lines = []
+    for i in range(rules):
+        sub = rng.choice(["alice", "bob", "carol", "admin", "editor", "banned"])
+        obj = rng.choice(["data1", "data2", "data3", "/files/*", "/files/a", "public"])
+        act = rng.choice(["read", "write"])
+        eft = rng.choice(["allow", "deny"])
+        if model_name in ("DENY_OVERRIDE", "ALLOW_AND_DENY"):
+            lines.append(f"p, {sub}, {obj}, {act}, {eft}")
+        elif model_name == "PRIORITY":
+            lines.append(f"p, {rng.randrange(5)}, {sub}, {obj}, {act}, {eft}")
+        else:
+            lines.append(f"p, {sub}, {obj}, {act}")
+    for user in ["alice", "bob", "carol", "dave"]:
+        lines.append(f"g, {user}, {rng.choice(['admin', 'editor'])}")
+    return "\n".join(lines)
+
+def _pair(model_text, policy_text):
+    def load(enforcer_class):
+        model = casbin.Model()
+        model.load_model_from_text(model_text)
+        return enforcer_class(model, StringAdapter(policy_text))
+    return load(casbin.Enforcer), load(IndexedEnforcer)
+
+def _requests(rng, count=300):
+    return [(rng.choice(["alice", "bob", "carol", "dave", "admin", "banned", "eve"]),
+             rng.choice(["data1", "data2", "data3", "/files/a", "/files/b", "public", "nothing"]),
+             rng.choice(["read", "write", "delete"])) for _ in range(count)]
+
+class TestEqualityConditions:
+    """Test cases for the matcher analysis"""
+
+    def test_rbac_matcher(self):
+        assert equality_conditions("g(r_sub, p_sub) && r_obj == p_obj && r_act == p_act",
+                                   ["r_sub", "r_obj", "r_act"], ["p_sub", "p_obj", "p_act"]) == [(1, 1, None), (2, 2, None)]
+
+    def test_constants_and_nesting(self):
+        conditions = equality_conditions('(p_act == "read" && (r_sub == p_sub)) && !(r_obj == p_obj)',
+                                         ["r_sub", "r_obj", "r_act"], ["p_sub", "p_obj", "p_act"])
+        assert conditions == [(0, 0, None), (2, None, "read")]
+
+    def test_unanalyzable_matchers(self):
+        r_tokens, p_tokens = ["r_sub", "r_obj", "r_act"], ["p_sub", "p_obj", "p_act"]
+        for matcher in ["r_sub == p_sub || r_obj == p_obj",
+                        "keyMatch(r_obj, p_obj) && r_sub != p_sub",
+                        'r_sub == p_sub && p_obj == "a && b"',
+                        "r_sub == p_sub &&"]:
+            assert equality_conditions(matcher, r_tokens, p_tokens) is None, matcher
+
+class TestIndexedEnforcer:
+    """Test cases for decisions made through the policy index"""
+
+    @pytest.mark.parametrize("model_name", ["RBAC", "DENY_OVERRIDE", "ALLOW_AND_DENY", "PRIORITY", "KEY_MATCH",
+                                            "CONSTANT", "DISJUNCTION"])
+    def test_decisions_match_a_full_scan(self, model_name):
+        rng = random.Random(model_name)
+        plain, indexed = _pair(globals()[model_name], _random_policy(rng, model_name))
+        assert (indexed.index_columns() is None) == (model_name == "DISJUNCTION")
+        for request in _requests(rng):
+            assert indexed.enforce_ex(*request) == plain.enforce_ex(*request), request
+
+    def test_index_follows_policy_changes(self):
+        rng = random.Random(7)
+        plain, indexed = _pair(RBAC, _random_policy(rng, "RBAC", rules=40))
+        requests = _requests(rng, 100)
+        for enforcer in (plain, indexed):
+            enforcer.enable_auto_save(False)
+
+        def check():
+            for request in requests:
+                assert indexed.enforce_ex(*request) == plain.enforce_ex(*request), request
+
+        for enforcer in (plain, indexed):
+            enforcer.add_policy("eve", "data1", "read")
+            enforcer.add_policies([["eve", "data2", "write"], ["dave", "nothing", "delete"]])
+        check()
+        for enforcer in (plain, indexed):
+            enforcer.update_policy(["eve", "data1", "read"], ["eve", "data3", "read"])
+            enforcer.remove_policy("eve", "data2", "write")
+        check()
+        for enforcer in (plain, indexed):
+            enforcer.remove_filtered_policy(1, "data1")
+            enforcer.delete_role("admin")
+        check()
+        for enforcer in (plain, indexed):
+            append_rules(enforcer, "p", [["carol", "public", "delete"]])
+            apply_rule_changes(enforcer, [("p", "bob", "nothing", "read")], [("p", "dave", "nothing", "delete")])
+        check()
+        for enforcer in (plain, indexed):
+            enforcer.load_policy()
+        check()
+
+    def test_indexed_example_model(self):
+        examples = os.path.join(os.path.dirname(__file__), '..', 'examples')
+        enforcer = EnforcerFactory.create_enforcer(os.path.join(examples, 'rbac_model.conf'),
+                                                   os.path.join(examples, 'rbac_policy.csv'), index=True)
+        assert isinstance(enforcer, IndexedEnforcer)
+        assert enforcer.index_columns() == ["p_obj", "p_act"]
+        assert enforcer.enforce_ex("alice", "data2", "write") == (True, ["data2_admin", "data2", "write"])
+        assert enforcer.enforce("alice", "data1", "read") and not enforcer.enforce("bob", "data1", "read")
+
+    def test_client_index_option(self):
+        """Test that --index answers like a plain enforcer, also in rebuilt worker processes"""
+        examples = os.path.join(os.path.dirname(__file__), '..', 'examples')
+        model, policy = os.path.join(examples, 'rbac_model.conf'), os.path.join(examples, 'rbac_policy.csv')
+        requests = ["alice,data1,read", "bob,data1,read", "alice,data2,write", "bob,data2,write"]
+        plain = Client.run(["batchEnforce", "-m", model, "-p", policy] + requests)
+        assert Client.run(["batchEnforce", "--index", "-m", model, "-p", policy] + requests) == plain
+
+        enforcer = EnforcerFactory.create_enforcer(model, policy, index=True)
+        parallel._init_worker(pickle.dumps(PolicyCache.snapshot(enforcer)), type(enforcer))
+        assert isinstance(parallel._worker_enforcer, IndexedEnforcer)
+        assert parallel._enforce_chunk([r.split(",") for r in requests]) == json.loads(plain)["explain"]
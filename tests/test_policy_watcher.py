@@ -0,0 +1,169 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.decision_cache import DecisionCache
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli import policy_watcher
+from casbin_cli.policy_watcher import PolicyWatcher
+from casbin_cli.session import Session
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples')
+MODEL = os.path.join(EXAMPLES, 'rbac_model.conf')
+
+POLICY = """p, alice, data1, read
+p, bob, data2, write
+p, data2_admin, data2, read
+p, data2_admin, data2, write
+g, alice, data2_admin
+"""
+
+def _write(path, text):
+    # Bump the mtime explicitly so back-to-back writes are seen on coarse-grained filesystems
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+class TestPolicyWatcher:
+    """Test cases for applying policy file edits to a running enforcer"""
+
+    def _session(self, tmp_path, **kwargs):
+        policy = str(tmp_path / 'policy.csv')
+        _write(policy, POLICY)
+        session = Session(EnforcerFactory.create_enforcer(MODEL, policy), **kwargs)
+        return session, PolicyWatcher(session, policy), policy
+
+    def test_unchanged_file(self, tmp_path):
+        _, watcher, _ = self._session(tmp_path)
+        assert watcher.poll() is None
+        assert watcher.reloads == 0
+
+    def test_added_and_removed_rules(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path)
+        enforcer = session.enforcer
+        _write(policy, POLICY.replace("p, bob, data2, write\n", "") + "p, carol, data3, read\ng, bob, data2_admin\n")
+
+        assert watcher.poll() == (2, 1)
+        assert enforcer.enforce("carol", "data3", "read")
+        assert enforcer.enforce("bob", "data2", "read")
+        assert not enforcer.has_policy("bob", "data2", "write")
+        # The file was the source of the change, nothing is written back
+        with open(policy, encoding='utf-8') as f:
+            assert "carol" in f.read()
+        assert watcher.poll() is None
+
+    def test_matches_a_full_reload(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path)
+        text = "# edited\np, alice, data1, write\np,alice,data1,read\ng, alice, data2_admin\n" \
+               "p, data2_admin, data2, read\n\np, data2_admin, data2, read\n"
+        _write(policy, text)
+        watcher.poll()
+
+        # Loading keeps duplicate lines as duplicate rules, the live enforcer holds each rule once
+        reloaded = EnforcerFactory.create_enforcer(MODEL, policy)
+        assert set(map(tuple, session.enforcer.get_policy())) == set(map(tuple, reloaded.get_policy()))
+        assert set(map(tuple, session.enforcer.get_grouping_policy())) == set(map(tuple, reloaded.get_grouping_policy()))
+
+    def test_moved_and_duplicated_rules(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path)
+        lines = POLICY.splitlines()
+        _write(policy, "\n".join(reversed(lines)) + "\np, alice, data1, read\n")
+        assert watcher.poll() == (0, 0)
+
+        # Removing one of two copies keeps the rule
+        _write(policy, "\n".join(reversed(lines)) + "\n")
+        assert watcher.poll() == (0, 0)
+        assert session.enforcer.has_policy("alice", "data1", "read")
+
+    def test_clears_the_decision_cache_and_role_index(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path, decision_cache=DecisionCache(100), role_index=True)
+        assert '"allow":true' in session.execute('enforce', ['alice', 'data2', 'write']).replace(' ', '')
+        assert session.role_index.implicit_roles('alice') == ['data2_admin']
+
+        _write(policy, POLICY.replace("g, alice, data2_admin\n", ""))
+        assert watcher.poll() == (0, 1)
+        assert '"allow":false' in session.execute('enforce', ['alice', 'data2', 'write']).replace(' ', '')
+        assert session.role_index.implicit_roles('alice') == []
+
+    def test_unknown_policy_types_are_skipped(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path, decision_cache=DecisionCache(100))
+        assert '"allow":false' in session.execute('enforce', ['carol', 'data3', 'read']).replace(' ', '')
+
+        _write(policy, POLICY + "p2, junk, x, y\np, carol, data3, read\n")
+        assert watcher.poll() == (1, 0)
+        assert '"allow":true' in session.execute('enforce', ['carol', 'data3', 'read']).replace(' ', '')
+        assert watcher.poll() is None
+
+        _write(policy, POLICY + "p, carol, data3, read\n")
+        assert watcher.poll() == (0, 0)
+        fresh = EnforcerFactory.create_enforcer(MODEL, policy)
+        assert sorted(session.enforcer.get_policy()) == sorted(fresh.get_policy())
+
+    def test_failed_apply_is_retried(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path, decision_cache=DecisionCache(100))
+        assert '"allow":false' in session.execute('enforce', ['carol', 'data3', 'read']).replace(' ', '')
+        _write(policy, POLICY + "p, carol, data3, read\n")
+
+        def fail_after_applying(enforcer, added, removed):
+            apply_rule_changes(enforcer, added, removed)
+            raise OSError("interrupted")
+
+        apply_rule_changes = policy_watcher.apply_rule_changes
+        with patch.object(policy_watcher, 'apply_rule_changes', side_effect=fail_after_applying):
+            try:
+                watcher.poll()
+                assert False, "Expected OSError"
+            except OSError:
+                pass
+        # The partly applied change is not answered from stale cached decisions
+        assert '"allow":true' in session.execute('enforce', ['carol', 'data3', 'read']).replace(' ', '')
+        assert watcher.poll() == (0, 0)
+        assert watcher.poll() is None
+
+    def test_own_writes_are_not_applied_twice(self, tmp_path):
+        session, watcher, policy = self._session(tmp_path)
+        session.execute('addPolicy', ['dave', 'data4', 'read'])
+        session.execute('removePolicy', ['bob', 'data2', 'write'])
+        watcher.poll()
+        assert session.enforcer.has_policy("dave", "data4", "read")
+        assert not session.enforcer.has_policy("bob", "data2", "write")
+
+    def test_background_thread(self, tmp_path):
+        session, _, policy = self._session(tmp_path)
+        watcher = PolicyWatcher(session, policy, interval=0.01).start()
+        try:
+            _write(policy, POLICY + "p, erin, data5, read\n")
+            deadline = time.time() + 5
+            while not session.enforcer.has_policy("erin", "data5", "read") and time.time() < deadline:
+                time.sleep(0.01)
+            assert session.enforcer.has_policy("erin", "data5", "read")
+        finally:
+            watcher.stop()
+
+    def test_invalid_interval(self, tmp_path):
+        session, _, policy = self._session(tmp_path)
+        try:
+            PolicyWatcher(session, policy, interval=0)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
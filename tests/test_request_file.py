@@ -0,0 +1,144 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.client import Client
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.parallel import ParallelBatchEnforcer
+from casbin_cli.request_file import InterruptedOutput, batch_enforce_file, read_requests
+
+REQUESTS = [["alice", "data1", "read"], ["bob", "data1", "read"], ["alice", "data2", "write"],
+            ["bob", "data2,data3", "write"], ["eve", "data3", "read"]] * 3
+
+def _write_requests(tmp_path, ndjson=False):
+    if ndjson:
+        path = tmp_path / "requests.ndjson"
+        path.write_text("".join(json.dumps(request) + "\n" for request in REQUESTS))
+    else:
+        path = tmp_path / "requests.csv"
+        lines = ["# sub, obj, act", ""]
+        lines += [", ".join(f'"{value}"' if ',' in value else value for value in request) for request in REQUESTS]
+        path.write_text("\n".join(lines))
+    return str(path)
+
+class TestRequestFile:
+    """Test cases for batchEnforce --requests"""
+
+    @pytest.mark.parametrize("ndjson", [False, True])
+    def test_read_requests(self, tmp_path, ndjson):
+        """Test that CSV and NDJSON files yield the same requests, quoted commas included"""
+        assert list(read_requests(_write_requests(tmp_path, ndjson))) == REQUESTS
+
+    def test_abac_and_invalid_rows(self, tmp_path):
+        """Test that JSON object values become attributes and malformed NDJSON rows name their line"""
+        csv_path = tmp_path / "abac.csv"
+        csv_path.write_text('"{""age"": 30}", data1, read\n')
+        assert list(read_requests(str(csv_path))) == [[{"age": 30}, "data1", "read"]]
+
+        ndjson_path = tmp_path / "bad.ndjson"
+        ndjson_path.write_text('["alice", "data1", "read"]\n\n{"sub": "alice"}\n')
+        with pytest.raises(ValueError, match=r"bad.ndjson:3: expected a JSON array"):
+            list(read_requests(str(ndjson_path)))
+
+        csv_path.write_text("# sub, obj, act\nalice, data1, read\nalice\n")
+        with pytest.raises(ValueError, match=r"abac.csv:3: expected 3 request values, got 1"):
+            list(read_requests(str(csv_path), size=3))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_streamed_response(self, tmp_path, temp_model_file, temp_policy_file, workers):
+        """Test that the streamed output is the batchEnforce response, chunk size and workers aside"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        expected = enforcer.batch_enforce(REQUESTS)
+        output = io.StringIO()
+        count = batch_enforce_file(enforcer, _write_requests(tmp_path), output, chunk_size=4, workers=workers)
+
+        assert count == len(REQUESTS)
+        assert json.loads(output.getvalue()) == {"allow": None, "explain": expected}
+
+        output = io.StringIO()
+        batch_enforce_file(enforcer, _write_requests(tmp_path, ndjson=True), output, chunk_size=4, ndjson=True)
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == expected
+
+    def test_chunks_are_read_as_results_are_taken(self, temp_model_file, temp_policy_file):
+        """Test that the pool reads only a bounded number of chunks ahead of the results"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        read = []
+
+        def chunks():
+            for i in range(20):
+                read.append(i)
+                yield [["alice", "data1", "read"]]
+
+        results = ParallelBatchEnforcer(enforcer, workers=2).enforce_chunks(chunks())
+        assert next(results) == [True]
+        assert len(read) <= 5
+        assert list(results) == [[True]] * 19
+
+    def test_client_requests_option(self, tmp_path, temp_model_file, temp_policy_file, capsys):
+        """Test that --requests prints the same response as request arguments"""
+        args = ["-m", temp_model_file, "-p", temp_policy_file]
+        expected = Client.run(["batchEnforce"] + args + [",".join(request) for request in REQUESTS[:3]])
+        capsys.readouterr()
+
+        path = tmp_path / "three.csv"
+        path.write_text("\n".join(",".join(request) for request in REQUESTS[:3]))
+        assert Client.run(["batchEnforce", "--requests", str(path)] + args) == ""
+        assert capsys.readouterr().out.strip() == expected
+
+        with pytest.raises(ValueError, match="only supported by batchEnforce"):
+            Client.run(["enforce", "--requests", str(path)] + args)
+        with pytest.raises(ValueError, match="not both"):
+            Client.run(["batchEnforce", "--requests", str(path)] + args + ["alice,data1,read"])
+
+    def test_invalid_row_in_a_later_chunk(self, tmp_path, temp_model_file, temp_policy_file, capsys):
+        """Test that a bad row writes none of its chunk and keeps the error off the decisions line"""
+        path = tmp_path / "requests.csv"
+        path.write_text("alice, data1, read\n" * 1500 + "alice\n")
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+
+        output = io.StringIO()
+        with pytest.raises(InterruptedOutput, match="requests.csv:1501: expected 3 request values"):
+            batch_enforce_file(enforcer, str(path), output)
+        assert output.getvalue() == '{"allow":null,"explain":[' + ",".join(["true"] * 1000) + "\n"
+
+        with pytest.raises(SystemExit):
+            Client.run(["batchEnforce", "--requests", str(path), "-m", temp_model_file, "-p", temp_policy_file])
+        captured = capsys.readouterr()
+        assert captured.out.endswith("true\n")
+        assert "expected 3 request values" in captured.err
+
+        # Nothing has been written when the first chunk fails, so the error is reported as usual
+        path.write_text("alice\n")
+        with pytest.raises(ValueError, match="expected 3 request values"):
+            Client.run(["batchEnforce", "--requests", str(path), "-m", temp_model_file, "-p", temp_policy_file])
+        assert capsys.readouterr().out == ""
+
+    def test_empty_file(self, tmp_path, temp_model_file, temp_policy_file):
+        """Test that a file without requests gives an empty response"""
+        path = tmp_path / "empty.csv"
+        path.write_text("# nothing yet\n")
+        output = io.StringIO()
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        assert batch_enforce_file(enforcer, str(path), output) == 0
+        assert json.loads(output.getvalue()) == {"allow": None, "explain": []}
@@ -0,0 +1,149 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import random
+import sys
+
+import casbin
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.bench import RBAC_MODEL
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.role_index import RoleClosureIndex
+from casbin_cli.session import Session
+
+DOMAIN_MODEL = """[request_definition]
+r = sub, dom, obj, act
+
+[policy_definition]
+p = sub, dom, obj, act
+
+[role_definition]
+g = _, _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub, r.dom) && r.dom == p.dom && r.obj == p.obj && r.act == p.act"""
+
+def _model(model_text):
+    model = casbin.Model()
+    model.load_model_from_text(model_text)
+    return model
+
+def _assert_matches_casbin(enforcer, index, names):
+    for name in names:
+        assert sorted(index.implicit_roles(name)) == sorted(enforcer.get_implicit_roles_for_user(name)), name
+        assert sorted(index.implicit_permissions(name)) == sorted(enforcer.get_implicit_permissions_for_user(name)), name
+        expected_users = sorted(user for user in names if name in enforcer.get_implicit_roles_for_user(user))
+        assert sorted(index.implicit_users(name)) == expected_users, name
+
+class TestRoleClosureIndex:
+    """Test cases for the materialized role closure"""
+
+    def test_deep_hierarchy(self):
+        """Test closures through a chain of roles, including a cycle"""
+        enforcer = casbin.Enforcer(_model(RBAC_MODEL), EnforcerFactory._load_adapter(False, "\n".join([
+            "p, r3, data, read", "p, alice, own, write",
+            "g, alice, r1", "g, r1, r2", "g, r2, r3", "g, r3, r1"])))
+        index = RoleClosureIndex(enforcer)
+
+        assert index.enabled
+        assert index.implicit_roles("alice") == ["r1", "r2", "r3"]
+        assert sorted(index.implicit_users("r3")) == ["alice", "r1", "r2", "r3"]
+        assert index.implicit_permissions("alice") == [["alice", "own", "write"], ["r3", "data", "read"]]
+        _assert_matches_casbin(enforcer, index, ["alice", "r1", "r2", "r3"])
+
+    def test_incremental_updates_match_casbin(self):
+        """Test that random grouping changes keep the index equal to casbin's graph walk"""
+        rng = random.Random(3)
+        names = [f"n{i}" for i in range(12)]
+        enforcer = casbin.Enforcer(_model(RBAC_MODEL), EnforcerFactory._load_adapter(False, "\n".join(
+            f"p, {name}, obj{i}, read" for i, name in enumerate(names))))
+        index = RoleClosureIndex(enforcer)
+
+        for _ in range(60):
+            user, role = rng.sample(names, 2)
+            if rng.random() < 0.6:
+                enforcer.add_grouping_policy(user, role)
+            elif rng.random() < 0.5:
+                enforcer.remove_grouping_policy(user, role)
+            else:
+                enforcer.delete_user(user)
+            index.sync()
+            _assert_matches_casbin(enforcer, index, names)
+
+    def test_sync_applies_only_grouping_changes(self):
+        """Test that sync follows batch, update and reload changes without rescanning the grouping rules"""
+        enforcer = casbin.Enforcer(_model(RBAC_MODEL), EnforcerFactory._load_adapter(False, "\n".join([
+            "p, r2, data, read", "g, alice, r1", "g, r1, r2", "g, bob, r1"])))
+        index = RoleClosureIndex(enforcer)
+        index._grouping_rules = None
+
+        enforcer.add_policy("carol", "data", "write")
+        index.sync()
+        enforcer.add_grouping_policies([["carol", "r2"], ["r2", "r3"]])
+        enforcer.get_model().update_policy("g", "g", ["bob", "r1"], ["bob", "r3"])
+        enforcer.remove_filtered_grouping_policy(1, "r1")
+        enforcer.build_role_links()
+        index.sync()
+        _assert_matches_casbin(enforcer, index, ["alice", "bob", "carol", "r1", "r2", "r3"])
+
+        del index._grouping_rules
+        enforcer.load_policy()
+        index.sync()
+        _assert_matches_casbin(enforcer, index, ["alice", "bob", "carol", "r1", "r2", "r3"])
+
+    def test_domain_model_falls_back(self):
+        """Test that grouping rules with domains are answered by casbin itself"""
+        enforcer = casbin.Enforcer(_model(DOMAIN_MODEL), EnforcerFactory._load_adapter(False, "\n".join([
+            "p, admin, d1, data1, read", "g, alice, admin, d1"])))
+        index = RoleClosureIndex(enforcer)
+
+        assert not index.enabled
+        assert index.implicit_roles("alice", "d1") == ["admin"]
+        assert index.implicit_permissions("alice", "d1") == [["admin", "d1", "data1", "read"]]
+
+class TestRoleIndexSession:
+    """Test cases for the role index in long-running sessions"""
+
+    def test_session_commands(self, temp_model_file, temp_policy_file):
+        """Test that RBAC commands are answered from the index and see role changes"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file), role_index=True)
+
+        def explain(cmd, *args):
+            return json.loads(session.execute(cmd, list(args)))["explain"]
+
+        assert explain("getImplicitRolesForUser", "alice") == ["data2_admin"]
+        assert explain("getImplicitUsersForRole", "data2_admin") == ["alice"]
+
+        session.execute("addRoleForUser", ["data2_admin", "auditor"])
+        session.execute("addPolicy", ["auditor", "logs", "read"])
+        assert sorted(explain("getImplicitRolesForUser", "alice")) == ["auditor", "data2_admin"]
+        assert ["auditor", "logs", "read"] in explain("getImplicitPermissionsForUser", "alice")
+        assert sorted(explain("getImplicitUsersForRole", "auditor")) == ["alice", "data2_admin"]
+
+        session.execute("deleteRoleForUser", ["alice", "data2_admin"])
+        assert explain("getImplicitRolesForUser", "alice") == []
+        assert explain("getImplicitUsersForRole", "auditor") == ["data2_admin"]
+
+    def test_without_index(self, temp_model_file, temp_policy_file):
+        """Test that getImplicitUsersForRole walks the role graph when no index is kept"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file))
+        assert json.loads(session.execute("getImplicitUsersForRole", ["data2_admin"]))["explain"] == ["alice"]
@@ -0,0 +1,71 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli import serializer as serializer_module
+from casbin_cli.serializer import Serializer, get_serializer, FAST_ENCODER_MIN_ROWS
+
+class TestSerializer:
+    """Test cases for the pluggable JSON encoder"""
+
+    @pytest.mark.parametrize("backend", Serializer.available())
+    def test_backends_match_stdlib(self, backend):
+        """Test that every installed backend produces the same compact UTF-8 JSON"""
+        body = {"allow": None, "explain": [["alice", "data/1", "读"], ["bob", "data2", "write"]]}
+        expected = json.dumps(body, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        assert Serializer(backend).dumps_bytes(body) == expected
+
+    def test_fallback_for_unsupported_values(self):
+        """Test that values a fast encoder rejects are encoded by the standard library"""
+        serializer = Serializer()
+        assert serializer.dumps({"explain": 2 ** 70}) == '{"explain":1180591620717411303424}'
+
+    def test_unknown_backend(self):
+        """Test that an unknown or missing backend is rejected"""
+        with pytest.raises(ValueError):
+            Serializer("yaml")
+        with patch.object(Serializer, '_load', return_value=None):
+            with pytest.raises(ValueError):
+                Serializer("ujson")
+
+    def test_line_writer(self):
+        """Test that lines go to the binary buffer when the stream has one"""
+        text = io.StringIO()
+        Serializer.line_writer(text)(b'["alice"]')
+        assert text.getvalue() == '["alice"]\n'
+
+        stream = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stream.write("first\n")
+        Serializer.line_writer(stream)(b'["bob"]')
+        assert stream.buffer.getvalue() == b'first\n["bob"]\n'
+
+    def test_small_payloads_use_stdlib(self, monkeypatch):
+        """Test that small one-shot payloads do not load the fast encoder"""
+        monkeypatch.setattr(serializer_module, '_default', None)
+        monkeypatch.delenv('CASBIN_CLI_JSON', raising=False)
+
+        assert get_serializer(rows=1).name == 'json'
+        assert serializer_module._default is None
+        assert get_serializer(rows=FAST_ENCODER_MIN_ROWS).name == Serializer.available()[0]
+        assert get_serializer(rows=1) is serializer_module._default
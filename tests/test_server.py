@@ -0,0 +1,272 @@
+# Copyright 2025 The casbin Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from casbin_cli.enforcer_factory import EnforcerFactory
+from casbin_cli.http_server import HttpCommandServer
+from casbin_cli.server import CommandServer
+from casbin_cli.session import Session
+
+def _start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+def _roundtrip(sock, requests):
+    stream = sock.makefile('rwb')
+    responses = []
+    for request in requests:
+        stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        stream.flush()
+        responses.append(json.loads(stream.readline()))
+    return responses
+
+class TestSession:
+    """Test cases for the Session request dispatcher"""
+
+    def test_handle_line(self, temp_model_file, temp_policy_file):
+        """Test that a JSON request line is answered with a ResponseBody line"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file))
+
+        response = json.loads(session.handle_line('{"cmd":"enforce","args":["alice","data2","read"]}'))
+        assert response == {"allow": True, "explain": None}
+
+        response = json.loads(session.handle_line('{"cmd":"getRolesForUser","args":["alice"]}'))
+        assert response["explain"] == ["data2_admin"]
+
+    def test_invalid_requests(self, temp_model_file, temp_policy_file):
+        """Test that malformed requests produce an error response instead of raising"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file))
+
+        for line in ['not json', '["enforce"]', '{"cmd":"enforce","args":"alice"}', '{"cmd":"noSuchCommand"}']:
+            response = json.loads(session.handle_line(line))
+            assert response["allow"] is None
+            assert response["error"]
+
+    def test_run_stream(self, temp_model_file, temp_policy_file):
+        """Test that stream mode answers each input line in order and skips blank lines"""
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file))
+        input_stream = io.StringIO(
+            '{"cmd":"enforce","args":["alice","data1","read"]}\n'
+            '\n'
+            '{"cmd":"getUsersForRole","args":["data2_admin"]}\n'
+            'oops\n'
+        )
+        output_stream = io.StringIO()
+
+        session.run_stream(input_stream, output_stream)
+
+        responses = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        assert len(responses) == 3
+        assert responses[0]["allow"] is True
+        assert responses[1]["explain"] == ["alice"]
+        assert "error" in responses[2]
+
+    def test_run_script_saves_once(self, temp_model_file, temp_policy_file):
+        """Test that a script applies every mutation and writes the policy file once"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        session = Session(enforcer)
+        script = io.StringIO(
+            '{"cmd":"addPolicy","args":["eve","data3","read"]}\n'
+            '{"cmd":"addRoleForUser","args":["bob","data2_admin"]}\n'
+            '{"cmd":"removeGroupingPolicy","args":["alice","data2_admin"]}\n'
+        )
+
+        with patch.object(enforcer, 'save_policy', wraps=enforcer.save_policy) as save_policy:
+            response = json.loads(session.run_script(script))
+            save_policy.assert_called_once()
+
+        assert response == {"allow": True, "explain": [True, True, True]}
+        reloaded = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        assert reloaded.enforce("eve", "data3", "read") is True
+        assert reloaded.enforce("bob", "data2", "read") is True
+        assert reloaded.enforce("alice", "data2", "read") is False
+
+    def test_run_script_rolls_back(self, temp_model_file, temp_policy_file):
+        """Test that the first failing line discards every earlier change"""
+        with open(temp_policy_file) as f:
+            original = f.read()
+        session = Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file))
+        script = io.StringIO(
+            '{"cmd":"addPolicy","args":["eve","data3","read"]}\n'
+            '{"cmd":"noSuchCommand","args":[]}\n'
+            '{"cmd":"addPolicy","args":["zed","data3","read"]}\n'
+        )
+
+        with pytest.raises(RuntimeError, match="Line 2"):
+            session.run_script(script)
+
+        assert json.loads(session.execute("enforce", ["eve", "data3", "read"]))["allow"] is False
+        with open(temp_policy_file) as f:
+            assert f.read() == original
+
+class TestCommandServer:
+    """Test cases for the serve daemon"""
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+    def test_unix_socket(self, temp_model_file, temp_policy_file):
+        """Test that one connection can issue several requests against the warm enforcer"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        socket_path = os.path.join(tempfile.mkdtemp(), 'casbin.sock')
+        server = CommandServer(Session(enforcer), socket_path=socket_path)
+        thread = _start(server)
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                responses = _roundtrip(sock, [
+                    {"cmd": "enforce", "args": ["alice", "data1", "read"]},
+                    {"cmd": "enforce", "args": ["bob", "data1", "read"]},
+                    {"cmd": "enforceEx", "args": ["alice", "data1", "read"]},
+                ])
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert responses[0]["allow"] is True
+        assert responses[1]["allow"] is False
+        assert responses[2]["explain"] == ["alice", "data1", "read"]
+        assert not os.path.exists(socket_path)
+
+    def test_tcp(self, temp_model_file, temp_policy_file):
+        """Test serving on an ephemeral localhost TCP port"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        server = CommandServer(Session(enforcer), port=0)
+        thread = _start(server)
+
+        try:
+            with socket.create_connection(server.address) as sock:
+                responses = _roundtrip(sock, [{"cmd": "hasRoleForUser", "args": ["alice", "data2_admin"]}])
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert responses[0]["allow"] is True
+
+    def test_requires_address(self, temp_model_file, temp_policy_file):
+        """Test that serve refuses to start without a socket path or port"""
+        enforcer = EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)
+        with pytest.raises(ValueError):
+            CommandServer(Session(enforcer))
+
+class TestHttpCommandServer:
+    """Test cases for the asyncio HTTP server"""
+
+    @staticmethod
+    def _post(connection, path, body=None):
+        connection.request("POST", path, body=json.dumps(body) if body is not None else None,
+                           headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_commands_over_one_connection(self, temp_model_file, temp_policy_file):
+        """Test that several POST requests share one keep-alive connection and the warm enforcer"""
+        server = HttpCommandServer(Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)), port=0)
+        assert server.address[0] == '127.0.0.1'
+        thread = _start(server)
+
+        try:
+            connection = http.client.HTTPConnection(*server.address, timeout=5)
+            assert self._post(connection, "/enforce", ["alice", "data1", "read"]) == (200, {"allow": True, "explain": None})
+            assert self._post(connection, "/addPolicy", {"args": ["eve", "data3", "read"]})[1]["allow"] is True
+            assert self._post(connection, "/enforce", ["eve", "data3", "read"])[1]["allow"] is True
+            status, response = self._post(connection, "/getPolicy")
+            assert status == 200 and ["eve", "data3", "read"] in response["explain"]
+
+            status, response = self._post(connection, "/unknownCommand", [])
+            assert status == 404 and "unknownCommand" in response["error"]
+            status, response = self._post(connection, "/diffPolicy", [temp_policy_file])
+            assert status == 403 and "local files" in response["error"]
+            status, response = self._post(connection, "/compile", [temp_policy_file])
+            assert status == 403
+            status, response = self._post(connection, "/getFilteredPolicy", ["sub"])
+            assert status == 400 and "Field index" in response["error"]
+            connection.close()
+        finally:
+            server.shutdown()
+            thread.join()
+
+    def test_inline_model_and_policy(self, temp_model_file, temp_policy_file):
+        """Test that a request may carry its own model and policy text, but never file paths"""
+        server = HttpCommandServer(Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)), port=0)
+        thread = _start(server)
+        with open(temp_model_file) as f:
+            model_text = f.read()
+
+        try:
+            connection = http.client.HTTPConnection(*server.address, timeout=5)
+            body = {"args": ["eve", "data9", "read"], "model": model_text, "policy": "p, eve, data9, read"}
+            assert self._post(connection, "/enforce", body)[1]["allow"] is True
+            # The session's enforcer is untouched
+            assert self._post(connection, "/enforce", ["eve", "data9", "read"])[1]["allow"] is False
+
+            # Read-only requests reuse the pooled enforcer, mutations get their own copy
+            assert self._post(connection, "/enforce", body)[1]["allow"] is True
+            self._post(connection, "/removePolicy", dict(body, args=["eve", "data9", "read"]))
+            assert self._post(connection, "/enforce", body)[1]["allow"] is True
+            stats = self._post(connection, "/enforcerPoolStats")[1]["explain"]
+            assert (stats["size"], stats["hits"], stats["misses"]) == (1, 2, 1)
+
+            status, response = self._post(connection, "/getPolicy", {"model": temp_model_file, "policy": temp_policy_file})
+            assert status == 400 and response["error"] == "Invalid model format"
+            connection.close()
+        finally:
+            server.shutdown()
+            thread.join()
+
+    def test_concurrent_clients_and_cors(self, temp_model_file, temp_policy_file):
+        """Test many concurrent connections and the CORS preflight"""
+        server = HttpCommandServer(Session(EnforcerFactory.create_enforcer(temp_model_file, temp_policy_file)),
+                                   port=0, allow_origin="https://editor.example")
+        thread = _start(server)
+        results = []
+
+        def client(user):
+            connection = http.client.HTTPConnection(*server.address, timeout=5)
+            results.append((user, self._post(connection, "/enforce", [user, "data1", "read"])[1]["allow"]))
+            connection.close()
+
+        try:
+            clients = [threading.Thread(target=client, args=(user,)) for user in ["alice", "bob"] * 10]
+            for c in clients:
+                c.start()
+            for c in clients:
+                c.join()
+
+            connection = http.client.HTTPConnection(*server.address, timeout=5)
+            connection.request("OPTIONS", "/enforce")
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 204
+            assert response.getheader("Access-Control-Allow-Origin") == "https://editor.example"
+            connection.close()
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert sorted(results) == sorted([("alice", True), ("bob", False)] * 10)